@@ -77,6 +77,12 @@ def run_query(argv=sys.argv[1:]):
         help="Show events for each match",
         action="store_true",
     )
+    parser.add_argument(
+        "--mode",
+        default="all",
+        help="Report all matches, or only non-overlapping matches",
+        choices=["all", "non_overlapping"],
+    )
     parser.add_argument(
         "--only-success",
         default=False,
@@ -131,7 +137,13 @@ def run_query(argv=sys.argv[1:]):
         raise Exception("You have to specify a dataset.")
 
     with performance_logging("searching", logger=logger):
-        matches = pm.search(dataset, query.pattern)
+        matches = pm.search(
+            dataset,
+            query.pattern,
+            max_duration=query.max_duration,
+            max_events=query.max_events,
+            mode=opts.mode,
+        )
 
     # Construct new code dataset with same properties (eg periods)
     # as original event dataset.
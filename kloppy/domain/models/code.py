@@ -1,9 +1,20 @@
 from dataclasses import dataclass, field
-from typing import List, Dict, Callable, Union, Any
+from typing import List, Dict, Callable, Iterable, Union, Any, Optional
 
 from kloppy.domain.models.common import DatasetType
 
-from .common import Dataset, DataRecord
+from .common import (
+    Dataset,
+    DataRecord,
+    _add_columns,
+    _apply_dtypes,
+    _check_dtypes,
+    _compact_column_dtypes,
+    _compact_dtypes,
+    _kinds_dtype,
+    _to_polars,
+    _value_kind,
+)
 from ...utils import docstring_inherit_attributes
 
 
@@ -31,6 +42,15 @@ class Code(DataRecord):
         return self.timestamp
 
 
+# Dtypes of `dtypes="compact"`. Label columns are categorical as well.
+_COMPACT_DTYPES = {
+    "period_id": "Int8",
+    "code_id": "category",
+    "code": "category",
+}
+_FLOAT_COLUMNS = ["timestamp", "end_timestamp"]
+
+
 @dataclass
 class CodeDataset(Dataset[Code]):
     records: List[Code]
@@ -41,13 +61,91 @@ class CodeDataset(Dataset[Code]):
     def codes(self):
         return self.records
 
+    def _pandas_columns(self, **kwargs):
+        names = dict.fromkeys(
+            ["code_id", "period_id", "timestamp", "end_timestamp", "code"]
+        )
+        first_code_columns = 0
+        for code in self.records:
+            names.update(dict.fromkeys(code.labels))
+            if not first_code_columns:
+                first_code_columns = len(names)
+        return list(names), first_code_columns
+
+    def _pandas_dtypes(self, dtypes: str = "default", **kwargs):
+        if dtypes != "compact":
+            return _code_column_dtypes(self.records)
+
+        categories = {"code_id": set(), "code": set()}
+        for code in self.records:
+            categories["code_id"].add(code.code_id)
+            categories["code"].add(code.code)
+            for name, value in code.labels.items():
+                values = categories.setdefault(name, set())
+                if value is not None:
+                    values.add(value)
+        return _compact_column_dtypes(
+            _COMPACT_DTYPES, _FLOAT_COLUMNS, categories
+        )
+
+    def to_polars(
+        self,
+        additional_columns: Dict[
+            str, Union[Callable[[Code], Any], Any]
+        ] = None,
+        lazy: bool = False,
+    ):
+        """
+        See [to_polars][kloppy.domain.models.common.Dataset.to_polars]
+        """
+        names, first_code_columns = self._pandas_columns()
+        columns = {name: [] for name in names}
+        for code in self.records:
+            columns["code_id"].append(code.code_id)
+            columns["period_id"].append(
+                code.period.id if code.period else None
+            )
+            columns["timestamp"].append(code.timestamp)
+            columns["end_timestamp"].append(code.end_timestamp)
+            columns["code"].append(code.code)
+            for name in names[5:]:
+                columns[name].append(code.labels.get(name))
+        return _to_polars(
+            _add_columns(
+                columns,
+                self.records,
+                additional_columns,
+                position=first_code_columns,
+            ),
+            lazy=lazy,
+        )
+
     def to_pandas(
         self,
         record_converter: Callable[[Code], Dict] = None,
         additional_columns: Dict[
             str, Union[Callable[[Code], Any], Any]
         ] = None,
+        chunksize: Optional[int] = None,
+        dtypes: str = "default",
     ) -> "DataFrame":
+        """
+        Convert the codes to a DataFrame. When `chunksize` is passed an
+        iterator of DataFrames is returned, see
+        [iter_pandas][kloppy.domain.models.common.Dataset.iter_pandas].
+
+        With `dtypes="compact"` the code and label columns are categorical,
+        `period_id` is a nullable integer and floats are float32.
+        """
+        _check_dtypes(dtypes)
+        if chunksize is not None:
+            return self.iter_pandas(
+                chunksize,
+                record_converter=record_converter,
+                additional_columns=additional_columns,
+                dtypes=dtypes,
+            )
+
         try:
             import pandas as pd
         except ImportError:
@@ -56,7 +154,10 @@ class CodeDataset(Dataset[Code]):
                 " install it using: pip install pandas"
             )
 
+        column_dtypes = {}
         if not record_converter:
+            if dtypes != "compact":
+                column_dtypes = _code_column_dtypes(self.records)
 
             def record_converter(code: Code) -> Dict:
                 row = dict(
@@ -82,9 +183,48 @@ class CodeDataset(Dataset[Code]):
 
             return row
 
-        return pd.DataFrame.from_records(
+        data_frame = pd.DataFrame.from_records(
             map(generic_record_converter, self.records)
         )
+        if dtypes == "compact":
+            data_frame = _compact_dtypes(
+                data_frame, self._pandas_dtypes(dtypes="compact")
+            )
+        else:
+            data_frame = _apply_dtypes(data_frame, column_dtypes)
+        return data_frame
+
+
+def _code_column_dtypes(codes: Iterable[Code]) -> Dict[str, Any]:
+    """
+    Returns the dtypes of the columns of `CodeDataset.to_pandas` with
+    `dtypes="default"`. Timestamps are float64, the dtype of other columns
+    follows from their values (see `_kinds_dtype`).
+    """
+    column_dtypes = {"timestamp": "float64", "end_timestamp": "float64"}
+    kinds: Dict[str, set] = {
+        "code_id": set(),
+        "period_id": set(),
+        "code": set(),
+    }
+    # Number of codes per label, codes without the label have no value
+    label_counts: Dict[str, int] = {}
+    n_codes = 0
+    for code in codes:
+        kinds["period_id"].add("int" if code.period else None)
+        kinds["code_id"].add(_value_kind(code.code_id))
+        kinds["code"].add(_value_kind(code.code))
+        for name, value in code.labels.items():
+            kinds.setdefault(name, set()).add(_value_kind(value))
+            label_counts[name] = label_counts.get(name, 0) + 1
+        n_codes += 1
+
+    for name, count in label_counts.items():
+        if count < n_codes:
+            kinds[name].add(None)
+    for name, value_kinds in kinds.items():
+        column_dtypes.setdefault(name, _kinds_dtype(value_kinds))
+    return column_dtypes
 
 
 __all__ = ["Code", "CodeDataset"]
@@ -0,0 +1,401 @@
+from dataclasses import MISSING, fields
+from typing import (
+    Any,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Type,
+    Union,
+)
+
+import numpy as np
+
+from .common import BallState, Period, Player, Team
+from .event import Event, EventType
+from .pitch import Point
+
+# Fields that are stored in the common columns, or not at all
+_COMMON_FIELDS = {field.name for field in fields(Event)}
+
+EVENT_TYPES: List[EventType] = list(EventType)
+BALL_STATES: List[BallState] = list(BallState)
+
+
+class _Categories:
+    """
+    Assigns integer codes to values. None is encoded as -1.
+    """
+
+    def __init__(self, values: Iterable[Hashable] = ()):
+        self.values: List[Hashable] = []
+        self._codes: Dict[Hashable, int] = {}
+        for value in values:
+            self.code(value)
+
+    def code(self, value: Optional[Hashable]) -> int:
+        if value is None:
+            return -1
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class SparseColumn:
+    """
+    Column that only has values for some of the events: `values[i]` is the
+    value of event `indices[i]`.
+    """
+
+    __slots__ = ("indices", "values")
+
+    def __init__(self, indices: np.ndarray, values: np.ndarray):
+        self.indices = indices
+        self.values = values
+
+    def __len__(self):
+        return len(self.indices)
+
+    def to_dense(self, length: int) -> np.ndarray:
+        """
+        Returns the column for all events, with NaN (for numeric columns)
+        or None for events that don't have a value.
+        """
+        if self.values.dtype.kind == "f":
+            result = np.full(length, np.nan)
+        else:
+            result = np.full(length, None, dtype=object)
+        result[self.indices] = self.values
+        return result
+
+    def take(self, index: np.ndarray) -> "SparseColumn":
+        """
+        Returns the values for the events at `index` (sorted positions),
+        renumbered to positions within `index`.
+        """
+        positions = np.searchsorted(index, self.indices)
+        positions = np.minimum(positions, len(index) - 1)
+        keep = (
+            index[positions] == self.indices
+            if len(index)
+            else np.zeros(len(self.indices), dtype=bool)
+        )
+        return SparseColumn(positions[keep], self.values[keep])
+
+
+def _sparse_values(values: List[Any]) -> np.ndarray:
+    if all(
+        value is None
+        or (isinstance(value, (int, float)) and not isinstance(value, bool))
+        for value in values
+    ):
+        return np.array(
+            [np.nan if value is None else value for value in values],
+            dtype=float,
+        )
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    return array
+
+
+class EventColumns:
+    """
+    Struct-of-arrays representation of the events of a dataset.
+
+    The attributes all events have are stored in dense numpy arrays (see
+    `columns`). Enums, teams and players are stored as integer codes (-1
+    for None), missing coordinates as NaN. Attributes of specific event
+    types are stored in sparse columns, only for the events that have
+    them.
+
+    Filtering uses boolean masks and returns a new `EventColumns`. `Event`
+    objects are only created when asked for: the original events when they
+    are kept, otherwise they are rebuilt from the columns. Rebuilt events
+    don't have a `raw_event` and have an empty `state`.
+    """
+
+    def __init__(
+        self,
+        columns: Dict[str, np.ndarray],
+        sparse_columns: Dict[str, SparseColumn],
+        event_classes: List[Type[Event]],
+        teams: List[Team],
+        players: List[Player],
+        results: List[Any],
+        periods: Dict[int, Period],
+        events: Optional[Sequence[Event]] = None,
+    ):
+        self.columns = columns
+        self.sparse_columns = sparse_columns
+        self.event_classes = event_classes
+        self.teams = teams
+        self.players = players
+        self.results = results
+        self.periods = periods
+        self._events = events
+
+    @classmethod
+    def from_events(
+        cls, events: Sequence[Event], keep_events: bool = True
+    ) -> "EventColumns":
+        n = len(events)
+        event_class = np.empty(n, dtype=np.int16)
+        event_type = np.empty(n, dtype=np.int16)
+        period_id = np.empty(n, dtype=np.int16)
+        timestamp = np.empty(n, dtype=np.float64)
+        team = np.empty(n, dtype=np.int32)
+        ball_owning_team = np.empty(n, dtype=np.int32)
+        ball_state = np.empty(n, dtype=np.int8)
+        player = np.empty(n, dtype=np.int32)
+        x = np.full(n, np.nan)
+        y = np.full(n, np.nan)
+        result = np.empty(n, dtype=np.int16)
+        success = np.empty(n, dtype=np.int8)
+        event_id = np.empty(n, dtype=object)
+
+        classes = _Categories()
+        event_types = _Categories(EVENT_TYPES)
+        ball_states = _Categories(BALL_STATES)
+        teams = _Categories()
+        players = _Categories()
+        results = _Categories()
+        periods = {}
+
+        # Per event class, the fields that go into sparse columns
+        class_fields = {}
+        sparse: Dict[str, tuple] = {}
+
+        for i, event in enumerate(events):
+            event_cls = type(event)
+            event_class[i] = classes.code(event_cls)
+            event_type[i] = event_types.code(event.event_type)
+            period_id[i] = event.period.id
+            periods.setdefault(event.period.id, event.period)
+            timestamp[i] = event.timestamp
+            team[i] = teams.code(event.team)
+            ball_owning_team[i] = teams.code(event.ball_owning_team)
+            ball_state[i] = ball_states.code(event.ball_state)
+            player[i] = players.code(event.player)
+            result[i] = results.code(event.result)
+            success[i] = (
+                -1 if event.result is None else int(event.result.is_success)
+            )
+            event_id[i] = event.event_id
+
+            coordinates = event.coordinates
+            if coordinates is not None:
+                x[i] = coordinates.x
+                y[i] = coordinates.y
+
+            extra_fields = class_fields.get(event_cls)
+            if extra_fields is None:
+                extra_fields = class_fields[event_cls] = [
+                    field
+                    for field in fields(event_cls)
+                    if field.name not in _COMMON_FIELDS
+                ]
+            for field in extra_fields:
+                value = getattr(event, field.name)
+                # Values that equal the default of the class are not stored
+                if field.default is not MISSING and value == field.default:
+                    continue
+                indices, values = sparse.setdefault(field.name, ([], []))
+                indices.append(i)
+                values.append(value)
+
+            # Values of the common fields that don't fit in the columns
+            if coordinates is not None and type(coordinates) is not Point:
+                indices, values = sparse.setdefault("coordinates", ([], []))
+                indices.append(i)
+                values.append(coordinates)
+            if event.qualifiers is not None:
+                indices, values = sparse.setdefault("qualifiers", ([], []))
+                indices.append(i)
+                values.append(event.qualifiers)
+
+        return cls(
+            columns={
+                "event_class": event_class,
+                "event_type": event_type,
+                "period_id": period_id,
+                "timestamp": timestamp,
+                "team": team,
+                "ball_owning_team": ball_owning_team,
+                "ball_state": ball_state,
+                "player": player,
+                "coordinates_x": x,
+                "coordinates_y": y,
+                "result": result,
+                "success": success,
+                "event_id": event_id,
+            },
+            sparse_columns={
+                name: SparseColumn(
+                    np.array(indices, dtype=np.int64), _sparse_values(values)
+                )
+                for name, (indices, values) in sparse.items()
+            },
+            event_classes=classes.values,
+            teams=teams.values,
+            players=players.values,
+            results=results.values,
+            periods=periods,
+            events=list(events) if keep_events else None,
+        )
+
+    def __len__(self) -> int:
+        return len(self.columns["event_type"])
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Returns a dense column. Sparse columns are expanded.
+        """
+        if name in self.columns:
+            return self.columns[name]
+        if name in self.sparse_columns:
+            return self.sparse_columns[name].to_dense(len(self))
+        raise KeyError(name)
+
+    def mask(
+        self,
+        event_type: Union[EventType, Iterable[EventType], None] = None,
+        team: Optional[Team] = None,
+        player: Optional[Player] = None,
+        period_id: Optional[int] = None,
+        success: Optional[bool] = None,
+    ) -> np.ndarray:
+        """
+        Returns a boolean mask of the events that match all given
+        conditions.
+
+        Examples:
+            >>> columns = dataset.to_columns()
+            >>> mask = columns.mask(event_type=EventType.PASS, team=home_team)
+            >>> passes = columns.filter(mask & (columns.column('timestamp') < 600))
+        """
+        mask = np.ones(len(self), dtype=bool)
+        if event_type is not None:
+            if isinstance(event_type, EventType):
+                event_type = [event_type]
+            mask &= np.isin(
+                self.columns["event_type"],
+                [EVENT_TYPES.index(type_) for type_ in event_type],
+            )
+        if team is not None:
+            mask &= self.columns["team"] == self._code(self.teams, team)
+        if player is not None:
+            mask &= self.columns["player"] == self._code(self.players, player)
+        if period_id is not None:
+            mask &= self.columns["period_id"] == period_id
+        if success is not None:
+            mask &= self.columns["success"] == int(success)
+        return mask
+
+    @staticmethod
+    def _code(values: List[Any], value: Any) -> int:
+        try:
+            return values.index(value)
+        except ValueError:
+            # No event has this value
+            return -2
+
+    def filter(self, mask: np.ndarray) -> "EventColumns":
+        """
+        Returns the events for which `mask` is True
+        """
+        index = np.flatnonzero(mask)
+        return EventColumns(
+            columns={
+                name: column[index] for name, column in self.columns.items()
+            },
+            sparse_columns={
+                name: column.take(index)
+                for name, column in self.sparse_columns.items()
+            },
+            event_classes=self.event_classes,
+            teams=self.teams,
+            players=self.players,
+            results=self.results,
+            periods=self.periods,
+            events=(
+                [self._events[i] for i in index]
+                if self._events is not None
+                else None
+            ),
+        )
+
+    def event(self, i: int) -> Event:
+        """
+        Returns the event at position `i`
+        """
+        if self._events is not None:
+            return self._events[i]
+        return self._build_event(i)
+
+    def to_events(self, mask: Optional[np.ndarray] = None) -> List[Event]:
+        """
+        Returns the events (for which `mask` is True)
+        """
+        if mask is None:
+            index = range(len(self))
+        else:
+            index = np.flatnonzero(mask)
+        return [self.event(i) for i in index]
+
+    def _sparse_value(self, name: str, i: int, default: Any) -> Any:
+        column = self.sparse_columns.get(name)
+        if column is None:
+            return default
+        pos = np.searchsorted(column.indices, i)
+        if pos < len(column.indices) and column.indices[pos] == i:
+            value = column.values[pos]
+            if column.values.dtype.kind == "f":
+                return None if np.isnan(value) else float(value)
+            return value
+        return default
+
+    def _build_event(self, i: int) -> Event:
+        columns = self.columns
+        event_cls = self.event_classes[columns["event_class"][i]]
+
+        coordinates = None
+        if not np.isnan(columns["coordinates_x"][i]):
+            coordinates = Point(
+                x=float(columns["coordinates_x"][i]),
+                y=float(columns["coordinates_y"][i]),
+            )
+
+        kwargs = dict(
+            event_id=columns["event_id"][i],
+            period=self.periods[int(columns["period_id"][i])],
+            timestamp=float(columns["timestamp"][i]),
+            team=_decode(self.teams, columns["team"][i]),
+            ball_owning_team=_decode(
+                self.teams, columns["ball_owning_team"][i]
+            ),
+            ball_state=_decode(BALL_STATES, columns["ball_state"][i]),
+            player=_decode(self.players, columns["player"][i]),
+            coordinates=self._sparse_value("coordinates", i, coordinates),
+            result=_decode(self.results, columns["result"][i]),
+            raw_event=None,
+            state={},
+            qualifiers=self._sparse_value("qualifiers", i, None),
+        )
+        for field in fields(event_cls):
+            if field.name in _COMMON_FIELDS or not field.init:
+                continue
+            value = self._sparse_value(field.name, i, MISSING)
+            if value is not MISSING:
+                kwargs[field.name] = value
+        return event_cls(**kwargs)
+
+
+def _decode(values: List[Any], code: int) -> Any:
+    return values[code] if code >= 0 else None
+
+
+__all__ = ["EventColumns", "SparseColumn"]
@@ -1,10 +1,25 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field, replace
 from enum import Enum, Flag
-from typing import Dict, List, Optional, Callable, Union, Any, TypeVar, Generic
+from itertools import islice
+from numbers import Integral, Real
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
 from .pitch import PitchDimensions, Point, Dimension
 from .formation import FormationType
+from .time_index import TimeIndex
 from ...exceptions import OrientationError
 
 
@@ -715,19 +730,181 @@ class Dataset(ABC, Generic[T]):
     records: List[T]
     metadata: Metadata
 
+    # Built on first use by `at`, `between` and `nearest`
+    _time_index: Optional[TimeIndex] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
     @property
     @abstractmethod
     def dataset_type(self) -> DatasetType:
         raise NotImplementedError
 
+    def get_time_index(self) -> TimeIndex:
+        """
+        Returns the index of the records by period and timestamp. The index
+        is built on first use, and rebuilt when `records` is replaced or
+        changes length.
+        """
+        if self._time_index is None or not self._time_index.is_valid_for(
+            self.records
+        ):
+            self._time_index = TimeIndex(self.records)
+        return self._time_index
+
+    def at(self, period_id: int, timestamp: float) -> Optional[T]:
+        """
+        Returns the last record at or before `timestamp` in a period
+
+        Examples:
+            >>> frame = dataset.at(period_id=1, timestamp=65.2)
+        """
+        return self.get_time_index().at(period_id, timestamp)
+
+    def between(
+        self, period_id: int, start_timestamp: float, end_timestamp: float
+    ) -> List[T]:
+        """
+        Returns the records of a period between two timestamps (inclusive)
+
+        Examples:
+            >>> frames = dataset.between(period_id=1, start_timestamp=60, end_timestamp=70)
+        """
+        return self.get_time_index().between(
+            period_id, start_timestamp, end_timestamp
+        )
+
+    def nearest(
+        self,
+        period_id: int,
+        timestamp: float,
+        tolerance: Optional[float] = None,
+    ) -> Optional[T]:
+        """
+        Returns the record of a period closest to `timestamp`, or None when
+        there is no record within `tolerance` seconds.
+        """
+        return self.get_time_index().nearest(
+            period_id, timestamp, tolerance=tolerance
+        )
+
     @abstractmethod
     def to_pandas(
         self,
         record_converter: Callable[[T], Dict] = None,
         additional_columns: Dict[str, Union[Callable[[T], Any], Any]] = None,
+        chunksize: Optional[int] = None,
+        dtypes: str = "default",
     ) -> "DataFrame":
         pass
 
+    @abstractmethod
+    def to_polars(
+        self,
+        additional_columns: Dict[str, Union[Callable[[T], Any], Any]] = None,
+        lazy: bool = False,
+    ):
+        """
+        Convert the records to a polars DataFrame, with the same columns as
+        `to_pandas()`. Enum values are categorical.
+
+        Arguments:
+            - additional_columns: see `to_pandas`
+            - lazy: return a LazyFrame
+        """
+        pass
+
+    def _pandas_columns(self, **kwargs) -> Optional[Tuple[List[str], int]]:
+        """
+        Returns the columns `to_pandas(**kwargs)` creates for all records,
+        and the number of columns of the first record (additional columns
+        are placed after those). Returns None when the columns are not known
+        up front.
+        """
+        return None
+
+    def _pandas_dtypes(self, **kwargs) -> Dict[str, Any]:
+        """
+        Returns the dtypes of the columns of `to_pandas(**kwargs)`, for all
+        records. `to_pandas` and every chunk of `iter_pandas` are converted
+        to these dtypes, so they don't depend on the values of the records
+        in a chunk.
+        """
+        return {}
+
+    def iter_pandas(
+        self,
+        chunk_size: int,
+        record_converter: Callable[[T], Dict] = None,
+        additional_columns: Dict[str, Union[Callable[[T], Any], Any]] = None,
+        columns: Optional[List[str]] = None,
+        **kwargs,
+    ) -> Iterator["DataFrame"]:
+        """
+        Convert the records to DataFrames of (at most) `chunk_size` rows.
+        Records are read from `records` one chunk at a time.
+
+        All chunks have the same columns: by default the columns of
+        `to_pandas()` for all records, with the same dtypes (categorical
+        columns have the categories of all records). The dtypes of
+        additional columns are determined per chunk. With a custom
+        `record_converter` the columns of the first chunk are used, unless
+        `columns` is passed, and dtypes are determined per chunk.
+        The index continues over the chunks, so concatenating them gives the
+        same rows as `to_pandas()`. Other keyword arguments are passed to
+        `to_pandas`.
+
+        Examples:
+            >>> for df in dataset.iter_pandas(chunk_size=10_000):
+            >>>     df.to_parquet(...)
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+
+        column_dtypes = {}
+        if not record_converter:
+            column_dtypes = self._pandas_dtypes(**kwargs)
+
+        if columns is None and not record_converter:
+            schema = self._pandas_columns(**kwargs)
+            if schema is not None:
+                names, position = schema
+                additional = [
+                    name
+                    for name in (additional_columns or {})
+                    if name not in names[:position]
+                ]
+                columns = (
+                    names[:position]
+                    + additional
+                    + [
+                        name
+                        for name in names[position:]
+                        if name not in additional
+                    ]
+                )
+
+        records = iter(self.records)
+        offset = 0
+        while True:
+            chunk = list(islice(records, chunk_size))
+            if not chunk:
+                break
+
+            data_frame = replace(self, records=chunk).to_pandas(
+                record_converter=record_converter,
+                additional_columns=additional_columns,
+                **kwargs,
+            )
+            if columns is None:
+                columns = list(data_frame.columns)
+            data_frame = _apply_dtypes(
+                data_frame.reindex(columns=columns), column_dtypes
+            )
+            data_frame.index = range(offset, offset + len(data_frame))
+            offset += len(data_frame)
+            yield data_frame
+
     def transform(self, *args, **kwargs):
         """
         See [transform][kloppy.helpers.transform]
@@ -787,3 +964,221 @@ class Dataset(ABC, Generic[T]):
             metadata=dataset.metadata,
             records=[mapper_fn(record) for record in dataset.records],
         )
+
+
+def _check_dtypes(dtypes: str):
+    if dtypes not in ("default", "compact"):
+        raise ValueError(
+            f"Unknown dtypes: {dtypes}. Use 'default' or 'compact'"
+        )
+
+
+def _sorted_categories(values: Iterable[Any]) -> List:
+    """
+    Categories of the categorical columns of compact exports, in a fixed
+    order so exports of different records (like the chunks of
+    `iter_pandas`) have the same categories for the same values.
+    """
+    return sorted(set(values), key=str)
+
+
+def _compact_dtypes(
+    data_frame: "DataFrame", column_dtypes: Dict[str, Any]
+) -> "DataFrame":
+    """
+    Convert the columns of `data_frame` to the dtypes of `column_dtypes`
+    (see `_compact_column_dtypes`), when present. Other float64 columns
+    (like additional columns) are converted to float32.
+    """
+    conversions = {}
+    for name, dtype in data_frame.dtypes.items():
+        if name in column_dtypes:
+            conversions[name] = column_dtypes[name]
+        elif dtype == "float64":
+            conversions[name] = "float32"
+    return _astype(data_frame, conversions)
+
+
+def _astype(data_frame: "DataFrame", dtypes: Dict[str, Any]) -> "DataFrame":
+    """
+    `DataFrame.astype` that also puts the categories of categorical columns
+    in the order of the dtype. pandas considers unordered categorical dtypes
+    with the same categories equal, and leaves those columns as they are.
+    """
+    import pandas as pd
+
+    data_frame = data_frame.astype(dtypes)
+    for name, dtype in dtypes.items():
+        if isinstance(dtype, pd.CategoricalDtype):
+            data_frame[name] = data_frame[name].cat.set_categories(
+                dtype.categories
+            )
+    return data_frame
+
+
+def _apply_dtypes(
+    data_frame: "DataFrame", column_dtypes: Dict[str, Any]
+) -> "DataFrame":
+    """
+    Convert the columns of `data_frame` that are in `column_dtypes` to
+    their dtype
+    """
+    return _astype(
+        data_frame,
+        {
+            name: dtype
+            for name, dtype in column_dtypes.items()
+            if name in data_frame.columns
+        },
+    )
+
+
+def _string_dtype() -> Any:
+    """
+    The dtype pandas gives a column of strings: "str" since pandas 3 (or
+    with the `future.infer_string` option), object before.
+    """
+    import pandas as pd
+
+    return pd.Series(["a"]).dtype
+
+
+def _value_kind(value: Any) -> Optional[str]:
+    """
+    The kind of a value for `_kinds_dtype`: "int", "float", "str",
+    "object" for anything else, or None for missing values (None and NaN).
+    """
+    if value is None or (isinstance(value, float) and value != value):
+        return None
+    if isinstance(value, bool):
+        return "object"
+    if isinstance(value, Integral):
+        return "int"
+    if isinstance(value, Real):
+        return "float"
+    if isinstance(value, str):
+        return "str"
+    return "object"
+
+
+def _kinds_dtype(kinds: Iterable[Optional[str]]) -> Any:
+    """
+    The dtype of a column with values of `kinds` (see `_value_kind`) that
+    doesn't depend on which of the values are in a DataFrame: int64 for
+    integers without missing values, float64 for other numbers, the string
+    dtype for strings and object for anything else.
+    """
+    kinds = set(kinds)
+    if kinds == {"int"}:
+        return "int64"
+    kinds.discard(None)
+    if kinds and kinds <= {"int", "float"}:
+        return "float64"
+    if kinds == {"str"}:
+        return _string_dtype()
+    return "object"
+
+
+def _compact_column_dtypes(
+    dtypes: Dict[str, str],
+    float_columns: Iterable[str],
+    categories: Dict[str, Iterable[Any]],
+) -> Dict[str, Any]:
+    """
+    Returns the dtypes of the columns of a compact export: `dtypes`,
+    float32 for `float_columns` (also when all their values are missing)
+    and categorical columns with the (sorted) values of `categories`.
+    `categories` must have the values of all "category" columns of
+    `dtypes`.
+    """
+    import pandas as pd
+
+    column_dtypes: Dict[str, Any] = {name: "float32" for name in float_columns}
+    column_dtypes.update(
+        (name, dtype) for name, dtype in dtypes.items() if dtype != "category"
+    )
+    column_dtypes.update(
+        (name, pd.CategoricalDtype(_sorted_categories(values)))
+        for name, values in categories.items()
+    )
+    return column_dtypes
+
+
+def _add_columns(
+    columns: Dict[str, Any],
+    records: List[DataRecord],
+    additional_columns: Optional[
+        Dict[str, Union[Callable[[DataRecord], Any], Any]]
+    ],
+    position: int,
+) -> Dict[str, Any]:
+    """
+    Add `additional_columns` to `columns`, after the first `position`
+    columns. Values can be a function of the record, a constant, or a numpy
+    array or pandas Series with a value for every record.
+    """
+    if not additional_columns:
+        return columns
+
+    additional_values = {}
+    for name, value in additional_columns.items():
+        if callable(value):
+            additional_values[name] = [value(record) for record in records]
+        elif hasattr(value, "__array__") and not isinstance(value, str):
+            if len(value) != len(records):
+                raise ValueError(
+                    f"Column {name} has {len(value)} values, expected "
+                    f"{len(records)}"
+                )
+            additional_values[name] = value
+        else:
+            additional_values[name] = [value] * len(records)
+
+    names = list(columns)
+    result = {}
+    for name in names[:position]:
+        result[name] = additional_values.get(name, columns[name])
+    result.update(additional_values)
+    for name in names[position:]:
+        if name not in additional_values:
+            result[name] = columns[name]
+    return result
+
+
+def _to_polars(
+    columns: Dict[str, Any],
+    categorical: Iterable[str] = (),
+    lazy: bool = False,
+):
+    """
+    Build a polars DataFrame (or LazyFrame) from columns of lists or numpy
+    arrays. NaN in a list marks a missing value and becomes null. String
+    columns in `categorical` are cast to Categorical.
+    """
+    try:
+        import polars as pl
+    except ImportError:
+        raise ImportError(
+            "Seems like you don't have polars installed. Please"
+            " install it using: pip install polars"
+        )
+
+    categorical = set(categorical)
+    series = []
+    for name, values in columns.items():
+        if hasattr(values, "dtype") and values.dtype.kind in "biuf":
+            values = pl.Series(
+                name, values, nan_to_null=values.dtype.kind == "f"
+            )
+        else:
+            values = pl.Series(
+                name,
+                [None if value != value else value for value in values],
+                strict=False,
+            )
+        if name in categorical and values.dtype == pl.String:
+            values = values.cast(pl.Categorical)
+        series.append(values)
+
+    data_frame = pl.DataFrame(series)
+    return data_frame.lazy() if lazy else data_frame
@@ -1,17 +1,40 @@
 # Metrica Documentation https://github.com/metrica-sports/sample-data/blob/master/documentation/events-definitions.pdf
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
-from typing import Dict, List, Type, Union, Any, Callable
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Type,
+    Union,
+)
 
 from kloppy.domain.models.common import DatasetType
+from kloppy.exceptions import KloppyError
 from kloppy.utils import (
     camelcase_to_snakecase,
     removes_suffix,
     docstring_inherit_attributes,
 )
 
-from .common import DataRecord, Dataset, Player, Team
+from .common import (
+    DataRecord,
+    Dataset,
+    Player,
+    Team,
+    _add_columns,
+    _apply_dtypes,
+    _check_dtypes,
+    _compact_column_dtypes,
+    _compact_dtypes,
+    _kinds_dtype,
+    _string_dtype,
+    _to_polars,
+)
 from .formation import FormationType
 from .pitch import Point
 
@@ -342,6 +365,56 @@ class CounterAttackQualifier(BoolQualifier):
     pass
 
 
+class _QualifierList(list):
+    """
+    The qualifiers of an event, with a mapping from qualifier type to
+    qualifier that is built on first use. The mapping includes all base
+    classes of the qualifiers, and the first qualifier of a type wins, like
+    it would when iterating over the qualifiers. Every change to the list
+    resets it.
+    """
+
+    _by_type = None
+
+    def by_type(self) -> Dict[Type[Qualifier], Qualifier]:
+        if self._by_type is None:
+            by_type = {}
+            for qualifier in self:
+                for qualifier_cls in type(qualifier).__mro__:
+                    by_type.setdefault(qualifier_cls, qualifier)
+            self._by_type = by_type
+        return self._by_type
+
+
+def _resetting(name: str):
+    method = getattr(list, name)
+
+    def wrapper(self, *args, **kwargs):
+        self._by_type = None
+        return method(self, *args, **kwargs)
+
+    wrapper.__name__ = name
+    return wrapper
+
+
+for _name in (
+    "__setitem__",
+    "__delitem__",
+    "__iadd__",
+    "__imul__",
+    "append",
+    "extend",
+    "insert",
+    "pop",
+    "remove",
+    "clear",
+    "sort",
+    "reverse",
+):
+    setattr(_QualifierList, _name, _resetting(_name))
+del _name
+
+
 @dataclass
 @docstring_inherit_attributes(DataRecord)
 class Event(DataRecord, ABC):
@@ -380,6 +453,10 @@ class Event(DataRecord, ABC):
     def event_name(self) -> str:
         raise NotImplementedError
 
+    def __post_init__(self):
+        if type(self.qualifiers) is list:
+            self.qualifiers = _QualifierList(self.qualifiers)
+
     @classmethod
     def create(cls, **kwargs):
         return cls(**kwargs, state={})
@@ -397,11 +474,21 @@ class Event(DataRecord, ABC):
             >>> pass_event.get_qualifier_value(SetPieceQualifier)
             <SetPieceType.GOAL_KICK: 'GOAL_KICK'>
         """
-        if self.qualifiers:
-            for qualifier in self.qualifiers:
-                if isinstance(qualifier, qualifier_type):
-                    return qualifier.value
-        return None
+        qualifiers = self.qualifiers
+        if not qualifiers:
+            return None
+        try:
+            by_type = qualifiers._by_type
+        except AttributeError:
+            # The qualifiers were replaced by a plain list
+            qualifiers = self.qualifiers = _QualifierList(qualifiers)
+            by_type = None
+        if by_type is None:
+            by_type = qualifiers.by_type()
+        qualifier = by_type.get(qualifier_type)
+        if qualifier is None:
+            return None
+        return qualifier.value
 
 
 @dataclass
@@ -650,17 +737,193 @@ class EventDataset(Dataset[Event]):
 
     dataset_type: DatasetType = DatasetType.EVENT
 
+    # Checkpoints used by `state_at`, per builder key and interval
+    _state_checkpoints: Dict = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    # Set by `add_state` or built on first use by `get_sequence_index`, and
+    # rebuilt when the events change
+    _sequence_index: Any = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
     @property
     def events(self):
         return self.records
 
-    def add_state(self, *builder_keys):
+    def add_state(self, *builder_keys, copy_events: bool = False):
         """
         See [add_state][kloppy.domain.services.state_builder.add_state]
         """
         from kloppy.domain.services.state_builder import add_state
 
-        return add_state(self, *builder_keys)
+        return add_state(self, *builder_keys, copy_events=copy_events)
+
+    def get_qualifier_values(self, qualifier_type: Type[Qualifier]) -> List:
+        """
+        Returns the value of a qualifier for all events, None for events
+        without the qualifier.
+
+        Examples:
+            >>> from kloppy.domain import SetPieceQualifier
+            >>> set_pieces = dataset.get_qualifier_values(SetPieceQualifier)
+        """
+        return [
+            event.get_qualifier_value(qualifier_type) for event in self.events
+        ]
+
+    def get_sequence_index(self) -> "SequenceIndex":
+        """
+        Returns the spans of all sequences. Requires the `sequence` state,
+        see [add_state][kloppy.domain.services.state_builder.add_state].
+        The index is rebuilt when `records` is replaced or changes length.
+        """
+        if self._sequence_index is None or not (
+            self._sequence_index.is_valid_for(self.records)
+        ):
+            from kloppy.domain.services.state_builder.builders.sequence import (
+                SequenceIndex,
+            )
+
+            if self.events and "sequence" not in self.events[0].state:
+                raise KloppyError(
+                    "Sequence state not available. Use "
+                    "dataset.add_state('sequence') first."
+                )
+            self._sequence_index = SequenceIndex.from_events(self.events)
+        return self._sequence_index
+
+    def get_sequence(self, sequence_id: int) -> List[Event]:
+        """
+        Returns the events of a sequence
+
+        Examples:
+            >>> dataset = dataset.add_state('sequence')
+            >>> events = dataset.get_sequence(10)
+        """
+        span = self.get_sequence_index()[sequence_id]
+        return self.events[span.start : span.end]
+
+    def get_sequences(self, team: Team = None) -> List["SequenceSpan"]:
+        """
+        Returns the spans of all sequences, or only the sequences of `team`
+
+        Examples:
+            >>> dataset = dataset.add_state('sequence')
+            >>> home_team, away_team = dataset.metadata.teams
+            >>> for span in dataset.get_sequences(home_team):
+            >>>     events = dataset.events[span.start : span.end]
+        """
+        index = self.get_sequence_index()
+        if team is None:
+            return index.spans
+        return index.get_team_spans(team)
+
+    def state_at(
+        self,
+        event_index: int,
+        builder_key: str,
+        checkpoint_interval: int = 100,
+    ) -> Any:
+        """
+        See [state_at][kloppy.domain.services.state_builder.state_at]
+        """
+        from kloppy.domain.services.state_builder import state_at
+
+        return state_at(
+            self,
+            event_index,
+            builder_key,
+            checkpoint_interval=checkpoint_interval,
+        )
+
+    def sync(
+        self,
+        tracking_dataset: "TrackingDataset",
+        tolerance: Optional[float] = None,
+        offset: Union[float, Dict[int, float]] = 0.0,
+        drift: float = 0.0,
+    ) -> "SyncResult":
+        """
+        See [sync][kloppy.domain.services.synchronization.sync]
+        """
+        try:
+            from kloppy.domain.services.synchronization import sync
+        except ImportError:
+            raise ImportError(
+                "Seems like you don't have numpy installed. Please"
+                " install it using: pip install numpy"
+            )
+
+        return sync(
+            self,
+            tracking_dataset,
+            tolerance=tolerance,
+            offset=offset,
+            drift=drift,
+        )
+
+    def to_columns(self, keep_events: bool = True) -> "EventColumns":
+        """
+        Returns the events as numpy arrays, see
+        [EventColumns][kloppy.domain.models.columnar.EventColumns].
+
+        Arguments:
+            - keep_events: keep a reference to the events, so materialising
+                them returns the original objects. When False, events are
+                rebuilt from the columns.
+
+        Examples:
+            >>> columns = dataset.to_columns()
+            >>> shots = columns.to_events(columns.mask(event_type=EventType.SHOT))
+        """
+        try:
+            from .columnar import EventColumns
+        except ImportError:
+            raise ImportError(
+                "Seems like you don't have numpy installed. Please"
+                " install it using: pip install numpy"
+            )
+
+        return EventColumns.from_events(self.events, keep_events=keep_events)
+
+    def _pandas_columns(self, **kwargs):
+        columns = _event_schema(self.records)
+        return list(columns.kinds), columns.first_record_columns
+
+    def _pandas_dtypes(self, dtypes: str = "default", **kwargs):
+        if dtypes != "compact":
+            return _default_dtypes(_event_schema(self.records), self.records)
+        return _compact_column_dtypes(
+            _COMPACT_DTYPES, _FLOAT_COLUMNS, _event_categories(self.records)
+        )
+
+    def to_polars(
+        self,
+        additional_columns: Dict[
+            str, Union[Callable[[Event], Any], Any]
+        ] = None,
+        lazy: bool = False,
+    ):
+        """
+        See [to_polars][kloppy.domain.models.common.Dataset.to_polars]
+
+        Examples:
+            >>> import polars as pl
+            >>> df = dataset.to_polars()
+            >>> shots = df.filter(pl.col("event_type") == "SHOT")
+        """
+        columns = _events_to_columns(self.records)
+        return _to_polars(
+            _add_columns(
+                columns.decode(),
+                self.records,
+                additional_columns,
+                position=columns.first_record_columns,
+            ),
+            categorical=columns.categories,
+            lazy=lazy,
+        )
 
     def to_pandas(
         self,
@@ -668,7 +931,27 @@ class EventDataset(Dataset[Event]):
         additional_columns: Dict[
             str, Union[Callable[[Event], Any], Any]
         ] = None,
+        chunksize: Optional[int] = None,
+        dtypes: str = "default",
     ) -> "DataFrame":
+        """
+        Convert the events to a DataFrame. When `chunksize` is passed an
+        iterator of DataFrames is returned, see
+        [iter_pandas][kloppy.domain.models.common.Dataset.iter_pandas].
+
+        With `dtypes="compact"` enum values and ids are categorical,
+        `period_id` and `success` are nullable and coordinates and
+        timestamps are float32.
+        """
+        _check_dtypes(dtypes)
+        if chunksize is not None:
+            return self.iter_pandas(
+                chunksize,
+                record_converter=record_converter,
+                additional_columns=additional_columns,
+                dtypes=dtypes,
+            )
+
         try:
             import pandas as pd
         except ImportError:
@@ -678,87 +961,28 @@ class EventDataset(Dataset[Event]):
             )
 
         if not record_converter:
-
-            def record_converter(event: Event) -> Dict:
-                row = dict(
-                    event_id=event.event_id,
-                    event_type=(
-                        event.event_type.value
-                        if event.event_type != EventType.GENERIC
-                        else f"GENERIC:{event.event_name}"
-                    ),
-                    result=event.result.value if event.result else None,
-                    success=event.result.is_success if event.result else None,
-                    period_id=event.period.id,
-                    timestamp=event.timestamp,
-                    end_timestamp=None,
-                    ball_state=event.ball_state.value
-                    if event.ball_state
-                    else None,
-                    ball_owning_team=event.ball_owning_team.team_id
-                    if event.ball_owning_team
-                    else None,
-                    team_id=event.team.team_id if event.team else None,
-                    player_id=event.player.player_id if event.player else None,
-                    coordinates_x=event.coordinates.x
-                    if event.coordinates
-                    else None,
-                    coordinates_y=event.coordinates.y
-                    if event.coordinates
-                    else None,
+            columns = _events_to_columns(self.records)
+            if dtypes == "compact":
+                values = columns.categoricals()
+            else:
+                values = columns.decode()
+            data_frame = pd.DataFrame(
+                _add_columns(
+                    values,
+                    self.records,
+                    additional_columns,
+                    position=columns.first_record_columns,
                 )
-                if isinstance(event, PassEvent):
-                    row.update(
-                        {
-                            "end_timestamp": event.receive_timestamp,
-                            "end_coordinates_x": event.receiver_coordinates.x
-                            if event.receiver_coordinates
-                            else None,
-                            "end_coordinates_y": event.receiver_coordinates.y
-                            if event.receiver_coordinates
-                            else None,
-                            "receiver_player_id": event.receiver_player.player_id
-                            if event.receiver_player
-                            else None,
-                        }
-                    )
-                elif isinstance(event, CarryEvent):
-                    row.update(
-                        {
-                            "end_timestamp": event.end_timestamp,
-                            "end_coordinates_x": event.end_coordinates.x
-                            if event.end_coordinates
-                            else None,
-                            "end_coordinates_y": event.end_coordinates.y
-                            if event.end_coordinates
-                            else None,
-                        }
-                    )
-                elif isinstance(event, ShotEvent):
-                    row.update(
-                        {
-                            "end_coordinates_x": event.result_coordinates.x
-                            if event.result_coordinates
-                            else None,
-                            "end_coordinates_y": event.result_coordinates.y
-                            if event.result_coordinates
-                            else None,
-                        }
-                    )
-                elif isinstance(event, CardEvent):
-                    row.update(
-                        {
-                            "card_type": event.card_type.value
-                            if event.card_type
-                            else None
-                        }
-                    )
-
-                if event.qualifiers:
-                    for qualifier in event.qualifiers:
-                        row.update(qualifier.to_dict())
-
-                return row
+            )
+            if dtypes == "compact":
+                data_frame = _compact_dtypes(
+                    data_frame, self._pandas_dtypes(dtypes="compact")
+                )
+            else:
+                data_frame = _apply_dtypes(
+                    data_frame, _default_dtypes(columns, self.records)
+                )
+            return data_frame
 
         def generic_record_converter(event: Event):
             row = record_converter(event)
@@ -772,9 +996,412 @@ class EventDataset(Dataset[Event]):
 
             return row
 
-        return pd.DataFrame.from_records(
+        data_frame = pd.DataFrame.from_records(
             map(generic_record_converter, self.records)
         )
+        if dtypes == "compact":
+            data_frame = _compact_dtypes(
+                data_frame, self._pandas_dtypes(dtypes="compact")
+            )
+        return data_frame
+
+
+# Kinds of columns of `_EventColumns`. Values are stored as they are, enums
+# as an index into the categories of the column.
+_VALUE = "value"
+_ENUM = "enum"
+
+# Code of an enum column for events that don't have the column
+_MISSING_CODE = -2
+
+
+class _EventColumns:
+    """
+    Columns of `EventDataset.to_pandas`, in the order in which they first
+    appear. Values of enum columns are stored as codes: -1 for None,
+    `_MISSING_CODE` for events that don't have the column.
+    """
+
+    def __init__(self):
+        self.kinds: Dict[str, str] = {}
+        self.values: Dict[str, List] = {}
+        self.categories: Dict[str, Dict[Any, int]] = {}
+        # Number of columns of the first event
+        self.first_record_columns = 0
+
+        # Per event class the event type it has the columns of, and per
+        # qualifier type its column (see `_qualifier_column`)
+        self.event_classes: Dict[Type[Event], Optional[Type[Event]]] = {}
+        self.qualifier_columns: Dict[Type[Qualifier], Optional[tuple]] = {}
+
+    def add(self, name: str, kind: str):
+        self.kinds.setdefault(name, kind)
+
+    def allocate(self, n: int):
+        """
+        Allocate the columns for `n` events
+        """
+        for name, kind in self.kinds.items():
+            if kind == _ENUM:
+                self.values[name] = [_MISSING_CODE] * n
+                self.categories[name] = {}
+            else:
+                self.values[name] = [float("nan")] * n
+
+    def set(self, name: str, index: int, value: Any):
+        """
+        Set a value of a column of any kind
+        """
+        categories = self.categories.get(name)
+        if categories is not None:
+            value = _code(categories, value)
+        self.values[name][index] = value
+
+    def decode(self) -> Dict[str, List]:
+        """
+        Returns the columns with the values of enum columns
+        """
+        columns = {}
+        for name, values in self.values.items():
+            categories = self.categories.get(name)
+            if categories is not None:
+                # Negative codes index from the end of the table
+                table = list(categories) + [float("nan"), None]
+                values = [table[code] for code in values]
+            columns[name] = values
+        return columns
+
+    def categoricals(self) -> Dict[str, Any]:
+        """
+        Returns the columns with enum columns as `pandas.Categorical`
+        """
+        import numpy as np
+        import pandas as pd
+
+        columns = dict(self.values)
+        for name, categories in self.categories.items():
+            # pandas uses -1 for missing values
+            codes = np.maximum(np.asarray(self.values[name]), -1)
+            columns[name] = pd.Categorical.from_codes(codes, list(categories))
+        return columns
+
+
+def _code(categories: Dict[Any, int], value: Any) -> int:
+    if value is None:
+        return -1
+    code = categories.get(value)
+    if code is None:
+        code = categories[value] = len(categories)
+    return code
+
+
+# Columns of `dtypes="compact"` that aren't enums or floats
+_COMPACT_DTYPES = {
+    "period_id": "Int8",
+    "success": "boolean",
+    "ball_owning_team": "category",
+    "team_id": "category",
+    "player_id": "category",
+    "receiver_player_id": "category",
+}
+
+# Columns that are float32 with `dtypes="compact"`, even when all values
+# are missing
+_FLOAT_COLUMNS = [
+    "timestamp",
+    "end_timestamp",
+    "coordinates_x",
+    "coordinates_y",
+    "end_coordinates_x",
+    "end_coordinates_y",
+]
+
+# Columns that hold strings with the default dtypes, next to the enum
+# columns
+_STRING_COLUMNS = [
+    "ball_owning_team",
+    "team_id",
+    "player_id",
+    "receiver_player_id",
+]
+
+_BASE_COLUMNS = [
+    ("event_id", _VALUE),
+    ("event_type", _ENUM),
+    ("result", _ENUM),
+    ("success", _VALUE),
+    ("period_id", _VALUE),
+    ("timestamp", _VALUE),
+    ("end_timestamp", _VALUE),
+    ("ball_state", _ENUM),
+    ("ball_owning_team", _VALUE),
+    ("team_id", _VALUE),
+    ("player_id", _VALUE),
+    ("coordinates_x", _VALUE),
+    ("coordinates_y", _VALUE),
+]
+
+# Columns of specific event types, and the attribute with the end
+# coordinates of the event
+_END_COORDINATES = [
+    ("end_coordinates_x", _VALUE),
+    ("end_coordinates_y", _VALUE),
+]
+_EVENT_COLUMNS = [
+    (PassEvent, _END_COORDINATES + [("receiver_player_id", _VALUE)]),
+    (CarryEvent, _END_COORDINATES),
+    (ShotEvent, _END_COORDINATES),
+    (CardEvent, [("card_type", _ENUM)]),
+]
+
+
+def _event_columns(event_cls: Type[Event]) -> tuple:
+    for cls, columns in _EVENT_COLUMNS:
+        if issubclass(event_cls, cls):
+            return cls, columns
+    return None, []
+
+
+def _qualifier_column(qualifier_cls: Type[Qualifier]) -> Optional[tuple]:
+    """
+    Returns the column and its kind of a qualifier type, or None when it
+    depends on the qualifier (see `Qualifier.to_dict`).
+    """
+    if qualifier_cls.name is not Qualifier.name:
+        return None
+    name = camelcase_to_snakecase(
+        removes_suffix(qualifier_cls.__name__, "Qualifier")
+    )
+    if qualifier_cls.to_dict is EnumQualifier.to_dict:
+        return f"{name}_type", _ENUM
+    if qualifier_cls.to_dict is BoolQualifier.to_dict:
+        return f"is_{name}", _VALUE
+    return None
+
+
+def _event_schema(events: Iterable[Event]) -> _EventColumns:
+    """
+    Determine the columns of `EventDataset.to_pandas` from the event and
+    qualifier types that occur in the events.
+    """
+    columns = _EventColumns()
+    for name, kind in _BASE_COLUMNS:
+        columns.add(name, kind)
+
+    event_classes = columns.event_classes
+    qualifier_columns = columns.qualifier_columns
+    for event in events:
+        event_cls = type(event)
+        if event_cls not in event_classes:
+            base_cls, extra_columns = _event_columns(event_cls)
+            event_classes[event_cls] = base_cls
+            for name, kind in extra_columns:
+                columns.add(name, kind)
+        if event.qualifiers:
+            for qualifier in event.qualifiers:
+                qualifier_cls = type(qualifier)
+                if qualifier_cls not in qualifier_columns:
+                    qualifier_columns[qualifier_cls] = _qualifier_column(
+                        qualifier_cls
+                    )
+                column = qualifier_columns[qualifier_cls]
+                if column is not None:
+                    columns.add(*column)
+                else:
+                    for name in qualifier.to_dict():
+                        columns.add(name, _VALUE)
+        if not columns.first_record_columns:
+            columns.first_record_columns = len(columns.kinds)
+
+    return columns
+
+
+def _default_dtypes(
+    columns: _EventColumns, events: Iterable[Event]
+) -> Dict[str, Any]:
+    """
+    Dtypes of the columns of `EventDataset.to_pandas` with
+    `dtypes="default"`, from the kind of the columns: float64 for
+    timestamps and coordinates, the string dtype for enums and ids and
+    object for other values (event ids aren't strings for every provider).
+    """
+    string_dtype = _string_dtype()
+    column_dtypes = {}
+    for name, kind in columns.kinds.items():
+        if name in _FLOAT_COLUMNS:
+            column_dtypes[name] = "float64"
+        elif kind == _ENUM or name in _STRING_COLUMNS:
+            column_dtypes[name] = string_dtype
+        else:
+            column_dtypes[name] = "object"
+    column_dtypes["period_id"] = _kinds_dtype(
+        "int" if event.period else None for event in events
+    )
+    return column_dtypes
+
+
+def _event_categories(events: Iterable[Event]) -> Dict[str, set]:
+    """
+    Values of the categorical columns of `EventDataset.to_pandas` with
+    `dtypes="compact"`: the enum columns and the id columns.
+    """
+    categories: Dict[str, set] = {
+        "event_type": set(),
+        "result": set(),
+        "ball_state": set(),
+        "ball_owning_team": set(),
+        "team_id": set(),
+        "player_id": set(),
+        "receiver_player_id": set(),
+    }
+    qualifier_columns: Dict[Type[Qualifier], Optional[tuple]] = {}
+    for event in events:
+        categories["event_type"].add(
+            event.event_type.value
+            if event.event_type != EventType.GENERIC
+            else f"GENERIC:{event.event_name}"
+        )
+        if event.result:
+            categories["result"].add(event.result.value)
+        if event.ball_state:
+            categories["ball_state"].add(event.ball_state.value)
+        if event.ball_owning_team:
+            categories["ball_owning_team"].add(event.ball_owning_team.team_id)
+        if event.team:
+            categories["team_id"].add(event.team.team_id)
+        if event.player:
+            categories["player_id"].add(event.player.player_id)
+        if isinstance(event, PassEvent) and event.receiver_player:
+            categories["receiver_player_id"].add(
+                event.receiver_player.player_id
+            )
+        elif isinstance(event, CardEvent) and event.card_type:
+            categories.setdefault("card_type", set()).add(
+                event.card_type.value
+            )
+
+        if event.qualifiers:
+            for qualifier in event.qualifiers:
+                qualifier_cls = type(qualifier)
+                if qualifier_cls not in qualifier_columns:
+                    qualifier_columns[qualifier_cls] = _qualifier_column(
+                        qualifier_cls
+                    )
+                column = qualifier_columns[qualifier_cls]
+                if column is not None and column[1] == _ENUM:
+                    categories.setdefault(column[0], set()).add(
+                        qualifier.value.value
+                    )
+    return categories
+
+
+def _events_to_columns(events: List[Event]) -> _EventColumns:
+    """
+    Build the columns of `EventDataset.to_pandas` without creating a row
+    per event: the columns are determined first, and then filled in one
+    pass.
+    """
+    columns = _event_schema(events)
+    columns.allocate(len(events))
+    event_classes = columns.event_classes
+    qualifier_columns = columns.qualifier_columns
+
+    values = columns.values
+    event_id = values["event_id"]
+    event_type = values["event_type"]
+    result = values["result"]
+    success = values["success"]
+    period_id = values["period_id"]
+    timestamp = values["timestamp"]
+    end_timestamp = values["end_timestamp"]
+    ball_state = values["ball_state"]
+    ball_owning_team = values["ball_owning_team"]
+    team_id = values["team_id"]
+    player_id = values["player_id"]
+    coordinates_x = values["coordinates_x"]
+    coordinates_y = values["coordinates_y"]
+    end_coordinates_x = values.get("end_coordinates_x")
+    end_coordinates_y = values.get("end_coordinates_y")
+    receiver_player_id = values.get("receiver_player_id")
+
+    event_types = columns.categories["event_type"]
+    results = columns.categories["result"]
+    ball_states = columns.categories["ball_state"]
+
+    for i, event in enumerate(events):
+        event_id[i] = event.event_id
+        event_type[i] = _code(
+            event_types,
+            (
+                event.event_type.value
+                if event.event_type != EventType.GENERIC
+                else f"GENERIC:{event.event_name}"
+            ),
+        )
+        if event.result:
+            result[i] = _code(results, event.result.value)
+            success[i] = event.result.is_success
+        else:
+            result[i] = -1
+            success[i] = None
+        period_id[i] = event.period.id
+        timestamp[i] = event.timestamp
+        end_timestamp[i] = None
+        ball_state[i] = _code(
+            ball_states, event.ball_state.value if event.ball_state else None
+        )
+        ball_owning_team[i] = (
+            event.ball_owning_team.team_id if event.ball_owning_team else None
+        )
+        team_id[i] = event.team.team_id if event.team else None
+        player_id[i] = event.player.player_id if event.player else None
+        if event.coordinates:
+            coordinates_x[i] = event.coordinates.x
+            coordinates_y[i] = event.coordinates.y
+        else:
+            coordinates_x[i] = coordinates_y[i] = None
+
+        base_cls = event_classes[type(event)]
+        end_coordinates = None
+        if base_cls is PassEvent:
+            end_timestamp[i] = event.receive_timestamp
+            end_coordinates = event.receiver_coordinates
+            receiver_player_id[i] = (
+                event.receiver_player.player_id
+                if event.receiver_player
+                else None
+            )
+        elif base_cls is CarryEvent:
+            end_timestamp[i] = event.end_timestamp
+            end_coordinates = event.end_coordinates
+        elif base_cls is ShotEvent:
+            end_coordinates = event.result_coordinates
+        elif base_cls is CardEvent:
+            columns.set(
+                "card_type",
+                i,
+                event.card_type.value if event.card_type else None,
+            )
+
+        if base_cls in (PassEvent, CarryEvent, ShotEvent):
+            if end_coordinates:
+                end_coordinates_x[i] = end_coordinates.x
+                end_coordinates_y[i] = end_coordinates.y
+            else:
+                end_coordinates_x[i] = end_coordinates_y[i] = None
+
+        if event.qualifiers:
+            for qualifier in event.qualifiers:
+                column = qualifier_columns[type(qualifier)]
+                if column is None:
+                    for name, value in qualifier.to_dict().items():
+                        columns.set(name, i, value)
+                elif column[1] == _ENUM:
+                    columns.set(column[0], i, qualifier.value.value)
+                else:
+                    columns.set(column[0], i, qualifier.value)
+
+    return columns
 
 
 __all__ = [
@@ -0,0 +1,166 @@
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, List, Optional, Sequence
+
+
+class TimeIndex:
+    """
+    Timestamps of the records of a dataset per period, sorted, so records
+    can be looked up by time with a binary search.
+
+    Records are looked up by period id and the timestamp within the period,
+    the same way `DataRecord.timestamp` is defined.
+    """
+
+    def __init__(self, records: Sequence[Any]):
+        self.records = records
+        self._length = len(records)
+
+        periods: Dict[Optional[int], List] = {}
+        for position, record in enumerate(records):
+            period_id = record.period.id if record.period else None
+            periods.setdefault(period_id, []).append(
+                (record.timestamp, position)
+            )
+
+        self.timestamps: Dict[Optional[int], List[float]] = {}
+        self.positions: Dict[Optional[int], List[int]] = {}
+        for period_id, entries in periods.items():
+            if any(
+                entries[i][0] > entries[i + 1][0]
+                for i in range(len(entries) - 1)
+            ):
+                entries.sort(key=lambda entry: entry[0])
+            self.timestamps[period_id] = [entry[0] for entry in entries]
+            self.positions[period_id] = [entry[1] for entry in entries]
+
+    def is_valid_for(self, records: Sequence[Any]) -> bool:
+        """
+        Returns if the index was built for `records` and they didn't change
+        length since.
+        """
+        return records is self.records and len(records) == self._length
+
+    def _period(self, period_id: int):
+        return (
+            self.timestamps.get(period_id, []),
+            self.positions.get(period_id, []),
+        )
+
+    def position_at(self, period_id: int, timestamp: float) -> Optional[int]:
+        """
+        Returns the position of the last record at or before `timestamp`
+        """
+        timestamps, positions = self._period(period_id)
+        i = bisect_right(timestamps, timestamp) - 1
+        return positions[i] if i >= 0 else None
+
+    def at(self, period_id: int, timestamp: float) -> Optional[Any]:
+        """
+        Returns the last record at or before `timestamp`, or None when the
+        period has no record before `timestamp`.
+        """
+        position = self.position_at(period_id, timestamp)
+        return self.records[position] if position is not None else None
+
+    def between(
+        self, period_id: int, start_timestamp: float, end_timestamp: float
+    ) -> List[Any]:
+        """
+        Returns the records with `start_timestamp <= timestamp <=
+        end_timestamp`, ordered by timestamp.
+        """
+        timestamps, positions = self._period(period_id)
+        start = bisect_left(timestamps, start_timestamp)
+        end = bisect_right(timestamps, end_timestamp)
+        return [self.records[position] for position in positions[start:end]]
+
+    def nearest(
+        self,
+        period_id: int,
+        timestamp: float,
+        tolerance: Optional[float] = None,
+    ) -> Optional[Any]:
+        """
+        Returns the record closest to `timestamp`, or None when there is no
+        record within `tolerance` seconds.
+        """
+        timestamps, positions = self._period(period_id)
+        if not timestamps:
+            return None
+
+        i = bisect_left(timestamps, timestamp)
+        # The closest record is either the first one at or after timestamp,
+        # or the one before it.
+        if i == len(timestamps) or (
+            i > 0
+            and timestamp - timestamps[i - 1] <= timestamps[i] - timestamp
+        ):
+            i -= 1
+        if (
+            tolerance is not None
+            and abs(timestamps[i] - timestamp) > tolerance
+        ):
+            return None
+        return self.records[positions[i]]
+
+
+class PeriodIndex:
+    """
+    Finds the period of a timestamp with a binary search over the period
+    starts. Timestamps are absolute, like `Period.start_timestamp` and
+    `Period.end_timestamp`.
+    """
+
+    def __init__(self, periods: Sequence[Any]):
+        self.periods = sorted(
+            periods, key=lambda period: period.start_timestamp
+        )
+        self.starts = [period.start_timestamp for period in self.periods]
+
+    def find(self, timestamp: float) -> Optional[Any]:
+        """
+        Returns the period that contains `timestamp`, or None
+        """
+        i = bisect_right(self.starts, timestamp) - 1
+        if i >= 0 and self.periods[i].end_timestamp >= timestamp:
+            return self.periods[i]
+        return None
+
+
+class FrameIdIndex:
+    """
+    Positions of frames by frame id. Frame ids don't need to be contiguous:
+    frames that were dropped (e.g. dead ball frames) are simply missing.
+    """
+
+    def __init__(self, frames: Sequence[Any]):
+        self.records = frames
+        self._length = len(frames)
+
+        self.positions: Dict[int, int] = {}
+        for position, frame in enumerate(frames):
+            self.positions.setdefault(frame.frame_id, position)
+
+        self.frame_ids = sorted(self.positions)
+
+    def is_valid_for(self, frames: Sequence[Any]) -> bool:
+        return frames is self.records and len(frames) == self._length
+
+    def get(self, frame_id: int) -> Optional[Any]:
+        position = self.positions.get(frame_id)
+        return self.records[position] if position is not None else None
+
+    def range(self, start_frame_id: int, end_frame_id: int) -> List[Any]:
+        """
+        Returns the frames with `start_frame_id <= frame_id <= end_frame_id`,
+        ordered by frame id.
+        """
+        start = bisect_left(self.frame_ids, start_frame_id)
+        end = bisect_right(self.frame_ids, end_frame_id)
+        return [
+            self.records[self.positions[frame_id]]
+            for frame_id in self.frame_ids[start:end]
+        ]
+
+
+__all__ = ["TimeIndex", "PeriodIndex", "FrameIdIndex"]
@@ -1,10 +1,32 @@
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Callable, Union, Any
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
 from kloppy.domain.models.common import DatasetType
 
-from .common import Dataset, DataRecord, Player
+from .common import (
+    Dataset,
+    DataRecord,
+    Player,
+    _apply_dtypes,
+    _check_dtypes,
+    _compact_column_dtypes,
+    _compact_dtypes,
+    _kinds_dtype,
+    _to_polars,
+    _value_kind,
+)
 from .pitch import Point
+from .time_index import FrameIdIndex
 
 
 @dataclass
@@ -36,6 +58,11 @@ class TrackingDataset(Dataset[Frame]):
 
     dataset_type: DatasetType = DatasetType.TRACKING
 
+    # Built on first use by `get_frame` and `get_frame_range`
+    _frame_id_index: Optional[FrameIdIndex] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
     @property
     def frames(self):
         return self.records
@@ -44,13 +71,195 @@ class TrackingDataset(Dataset[Frame]):
     def frame_rate(self):
         return self.metadata.frame_rate
 
+    def _get_frame_id_index(self) -> FrameIdIndex:
+        if (
+            self._frame_id_index is None
+            or not self._frame_id_index.is_valid_for(self.records)
+        ):
+            self._frame_id_index = FrameIdIndex(self.records)
+        return self._frame_id_index
+
+    def get_frame(self, frame_id: int) -> Optional[Frame]:
+        """
+        Returns the frame with `frame_id`, or None when the dataset doesn't
+        have that frame (for example when dead ball frames were skipped).
+
+        Examples:
+            >>> frame = dataset.get_frame(10000)
+        """
+        return self._get_frame_id_index().get(frame_id)
+
+    def get_frame_range(
+        self, start_frame_id: int, end_frame_id: int
+    ) -> List[Frame]:
+        """
+        Returns the frames with a frame id between `start_frame_id` and
+        `end_frame_id` (inclusive). Frame ids that are missing are skipped.
+        """
+        return self._get_frame_id_index().range(start_frame_id, end_frame_id)
+
+    def _pandas_columns(self, layout: str = "wide", **kwargs):
+        if layout == "long":
+            return list(LONG_COLUMNS), len(LONG_COLUMNS)
+        return _frame_column_names(self.records)
+
+    def _pandas_dtypes(
+        self, layout: str = "wide", dtypes: str = "default", **kwargs
+    ):
+        import pandas as pd
+
+        if layout == "long":
+            categories = _long_categories(self.records)
+            if dtypes != "compact":
+                return {
+                    name: pd.CategoricalDtype(values)
+                    for name, values in categories.items()
+                }
+        elif dtypes == "compact":
+            categories = {
+                "ball_state": {
+                    frame.ball_state.value
+                    for frame in self.records
+                    if frame.ball_state
+                },
+                "ball_owning_team_id": {
+                    frame.ball_owning_team.team_id
+                    for frame in self.records
+                    if frame.ball_owning_team
+                },
+            }
+        else:
+            return _frame_column_dtypes(self.records)
+
+        return _compact_column_dtypes(
+            _COMPACT_DTYPES, self._float_columns(layout), categories
+        )
+
+    def to_numpy(self, layout: str = "long") -> Dict[str, "np.ndarray"]:
+        """
+        Convert the frames to a dict of numpy arrays.
+
+        Arguments:
+            - layout: "long" for one row per frame and player on the pitch
+                (see `LONG_COLUMNS`), "wide" for one row per frame with the
+                columns of `to_pandas`. Missing values are NaN; in the
+                long layout `period_id` is therefore a float array.
+
+        Examples:
+            >>> arrays = dataset.to_numpy()
+            >>> home = arrays["team_id"] == dataset.metadata.teams[0].team_id
+            >>> mean_x = arrays["x"][home].mean()
+        """
+        try:
+            import numpy as np
+        except ImportError:
+            raise ImportError(
+                "Seems like you don't have numpy installed. Please"
+                " install it using: pip install numpy"
+            )
+
+        if layout == "long":
+            columns, categories = _frames_to_long_columns(self.records)
+            del columns["_frame_index"]
+            for name, values in categories.items():
+                # Code -1 (no value) refers to the None at the end
+                table = np.empty(len(values) + 1, dtype=object)
+                table[:-1] = values
+                columns[name] = table[columns[name]]
+            return columns
+        if layout == "wide":
+            return {
+                name: np.asarray(values)
+                for name, values in _frames_to_columns(self.records).items()
+            }
+        raise ValueError(f"Unknown layout: {layout}")
+
+    def to_polars(
+        self,
+        additional_columns: Dict[
+            str, Union[Callable[[Frame], Any], Any]
+        ] = None,
+        lazy: bool = False,
+        layout: str = "wide",
+    ):
+        """
+        See [to_polars][kloppy.domain.models.common.Dataset.to_polars]. The
+        `layout` is the same as for `to_pandas`.
+        """
+        if layout == "long":
+            columns, categories = _frames_to_long_columns(self.records)
+            frame_index = columns.pop("_frame_index")
+            for name, values in categories.items():
+                # Code -1 (no value) refers to the None at the end
+                table = values + [None]
+                columns[name] = [table[code] for code in columns[name]]
+            data_frame = _to_polars(columns, categorical=categories)
+            if additional_columns:
+                import polars as pl
+
+                for name, value in additional_columns.items():
+                    if callable(value):
+                        # Evaluated once per frame
+                        per_frame = pl.Series(
+                            name,
+                            [value(frame) for frame in self.records],
+                            strict=False,
+                        )
+                        value = per_frame.gather(frame_index)
+                    else:
+                        value = pl.repeat(
+                            value, len(frame_index), eager=True
+                        ).alias(name)
+                    data_frame = data_frame.with_columns(value)
+            return data_frame.lazy() if lazy else data_frame
+        if layout != "wide":
+            raise ValueError(f"Unknown layout: {layout}")
+
+        return _to_polars(
+            _frames_to_columns(self.records, additional_columns),
+            categorical=["ball_state"],
+            lazy=lazy,
+        )
+
     def to_pandas(
         self,
         record_converter: Callable[[Frame], Dict] = None,
         additional_columns: Dict[
             str, Union[Callable[[Frame], Any], Any]
         ] = None,
+        chunksize: Optional[int] = None,
+        layout: str = "wide",
+        dtypes: str = "default",
     ) -> "DataFrame":
+        """
+        Convert the frames to a DataFrame. When `chunksize` is passed an
+        iterator of DataFrames is returned, see
+        [iter_pandas][kloppy.domain.models.common.Dataset.iter_pandas].
+
+        Arguments:
+            - record_converter: function that converts a frame to a row.
+                Only for the wide layout.
+            - additional_columns: extra columns, as a constant or a function
+                of the frame
+            - chunksize:
+            - layout: "wide" for one row per frame with columns per player,
+                "long" for one row per frame and player on the pitch. In
+                the long layout the player, team, jersey number and position
+                columns are categorical.
+            - dtypes: "compact" for float32 coordinates and timestamps,
+                nullable integer frame and period ids, and categorical ids
+                and ball state.
+        """
+        _check_dtypes(dtypes)
+        if chunksize is not None:
+            return self.iter_pandas(
+                chunksize,
+                record_converter=record_converter,
+                additional_columns=additional_columns,
+                layout=layout,
+                dtypes=dtypes,
+            )
+
         try:
             import pandas as pd
         except ImportError:
@@ -59,53 +268,69 @@ class TrackingDataset(Dataset[Frame]):
                 " install it using: pip install pandas"
             )
 
-        if not record_converter:
-
-            def record_converter(frame: Frame) -> Dict:
-                row = dict(
-                    period_id=frame.period.id if frame.period else None,
-                    timestamp=frame.timestamp,
-                    ball_state=frame.ball_state.value
-                    if frame.ball_state
-                    else None,
-                    ball_owning_team_id=frame.ball_owning_team.team_id
-                    if frame.ball_owning_team
-                    else None,
-                    ball_x=frame.ball_coordinates.x
-                    if frame.ball_coordinates
-                    else None,
-                    ball_y=frame.ball_coordinates.y
-                    if frame.ball_coordinates
-                    else None,
+        if layout == "long":
+            if record_converter:
+                raise ValueError(
+                    "record_converter is not supported for the long layout"
+                )
+            columns, categories = _frames_to_long_columns(self.records)
+            frame_index = columns.pop("_frame_index")
+            for name, values in categories.items():
+                columns[name] = pd.Categorical.from_codes(
+                    columns[name], values
                 )
-                for player, player_data in frame.players_data.items():
-                    row.update(
-                        {
-                            f"{player.player_id}_x": player_data.coordinates.x,
-                            f"{player.player_id}_y": player_data.coordinates.y,
-                            f"{player.player_id}_d": player_data.distance,
-                            f"{player.player_id}_s": player_data.speed,
-                        }
-                    )
-
-                    if player_data.other_data:
-                        for name, value in player_data.other_data.items():
-                            row.update(
-                                {
-                                    f"{player.player_id}_{name}": value,
-                                }
-                            )
-
-                if frame.other_data:
-                    for name, value in frame.other_data.items():
-                        row.update(
-                            {
-                                name: value,
-                            }
+            if additional_columns:
+                for name, value in additional_columns.items():
+                    if callable(value):
+                        # Evaluated once per frame
+                        per_frame = pd.Series(
+                            [value(frame) for frame in self.records]
                         )
+                        columns[name] = per_frame.to_numpy()[frame_index]
+                    else:
+                        columns[name] = [value] * len(frame_index)
+            data_frame = pd.DataFrame(columns)
+        elif layout != "wide":
+            raise ValueError(f"Unknown layout: {layout}")
+        elif not record_converter:
+            data_frame = pd.DataFrame(
+                _frames_to_columns(self.records, additional_columns)
+            )
+            if dtypes != "compact":
+                data_frame = _apply_dtypes(
+                    data_frame, _frame_column_dtypes(self.records)
+                )
+        else:
+            data_frame = pd.DataFrame.from_records(
+                self._records_to_rows(record_converter, additional_columns)
+            )
 
-                return row
+        if dtypes == "compact":
+            data_frame = _compact_dtypes(
+                data_frame,
+                self._pandas_dtypes(layout=layout, dtypes="compact"),
+            )
+        return data_frame
+
+    def _float_columns(self, layout: str) -> List[str]:
+        """
+        Returns the float columns of `to_pandas`. The columns of the players
+        are taken from the metadata.
+        """
+        if layout == "long":
+            return _LONG_FLOAT_COLUMNS
+        return _WIDE_FLOAT_COLUMNS + [
+            f"{player.player_id}_{suffix}"
+            for team in self.metadata.teams
+            for player in team.players
+            for suffix in ("x", "y", "d", "s")
+        ]
 
+    def _records_to_rows(
+        self,
+        record_converter: Callable[[Frame], Dict],
+        additional_columns: Dict[str, Union[Callable[[Frame], Any], Any]],
+    ) -> Iterator[Dict]:
         def generic_record_converter(frame: Frame):
             row = record_converter(frame)
             if additional_columns:
@@ -118,9 +343,340 @@ class TrackingDataset(Dataset[Frame]):
 
             return row
 
-        return pd.DataFrame.from_records(
-            map(generic_record_converter, self.records)
+        return map(generic_record_converter, self.records)
+
+
+def _frame_column_names(frames: Iterable[Frame]) -> Tuple[List[str], int]:
+    """
+    Returns the columns `_frames_to_columns` creates, and the number of
+    columns of the first frame.
+    """
+    names = {
+        "period_id": None,
+        "timestamp": None,
+        "ball_state": None,
+        "ball_owning_team_id": None,
+        "ball_x": None,
+        "ball_y": None,
+    }
+    first_frame_columns = 0
+    players = set()
+    for frame in frames:
+        for player, player_data in frame.players_data.items():
+            if player not in players:
+                players.add(player)
+                for suffix in ("x", "y", "d", "s"):
+                    names[f"{player.player_id}_{suffix}"] = None
+            if player_data.other_data:
+                for name in player_data.other_data:
+                    names[f"{player.player_id}_{name}"] = None
+        if frame.other_data:
+            for name in frame.other_data:
+                names[name] = None
+        if not first_frame_columns:
+            first_frame_columns = len(names)
+    return list(names), first_frame_columns
+
+
+def _frame_column_dtypes(frames: Iterable[Frame]) -> Dict[str, Any]:
+    """
+    Returns the dtypes of the columns `_frames_to_columns` creates with
+    `dtypes="default"`. The coordinates of the players are float64, the
+    dtype of other columns follows from their values (see `_kinds_dtype`).
+    """
+    column_dtypes = {}
+    kinds: Dict[str, set] = {
+        "period_id": set(),
+        "timestamp": set(),
+        "ball_state": set(),
+        "ball_owning_team_id": set(),
+        "ball_x": set(),
+        "ball_y": set(),
+    }
+    players = set()
+    # Number of frames per other data column, frames without it have no
+    # value
+    other_counts: Dict[str, int] = {}
+    n_frames = 0
+    for frame in frames:
+        n_frames += 1
+        kinds["period_id"].add("int" if frame.period else None)
+        kinds["timestamp"].add(_value_kind(frame.timestamp))
+        kinds["ball_state"].add("str" if frame.ball_state else None)
+        kinds["ball_owning_team_id"].add(
+            "str" if frame.ball_owning_team else None
         )
+        if frame.ball_coordinates:
+            kinds["ball_x"].add(_value_kind(frame.ball_coordinates.x))
+            kinds["ball_y"].add(_value_kind(frame.ball_coordinates.y))
+        else:
+            kinds["ball_x"].add(None)
+            kinds["ball_y"].add(None)
+        for player, player_data in frame.players_data.items():
+            if player not in players:
+                players.add(player)
+                for suffix in ("x", "y", "d", "s"):
+                    column_dtypes[f"{player.player_id}_{suffix}"] = "float64"
+            if player_data.other_data:
+                for name, value in player_data.other_data.items():
+                    name = f"{player.player_id}_{name}"
+                    kinds.setdefault(name, set()).add(_value_kind(value))
+                    other_counts[name] = other_counts.get(name, 0) + 1
+        if frame.other_data:
+            for name, value in frame.other_data.items():
+                kinds.setdefault(name, set()).add(_value_kind(value))
+                other_counts[name] = other_counts.get(name, 0) + 1
+
+    for name, count in other_counts.items():
+        if count < n_frames:
+            kinds[name].add(None)
+    for name, value_kinds in kinds.items():
+        column_dtypes.setdefault(name, _kinds_dtype(value_kinds))
+    return column_dtypes
+
+
+def _frames_to_columns(
+    frames: List[Frame],
+    additional_columns: Dict[str, Union[Callable[[Frame], Any], Any]] = None,
+) -> Dict[str, List]:
+    """
+    Build the columns of `TrackingDataset.to_pandas`. Every column is
+    allocated once for all frames; values that are missing in a frame (a
+    player that is not on the pitch, other data that is not always set)
+    are NaN.
+    """
+    n = len(frames)
+    nan = float("nan")
+    columns: Dict[str, List] = {}
+
+    def column(name: str) -> List:
+        values = columns.get(name)
+        if values is None:
+            values = columns[name] = [nan] * n
+        return values
+
+    period_id = column("period_id")
+    timestamp = column("timestamp")
+    ball_state = column("ball_state")
+    ball_owning_team_id = column("ball_owning_team_id")
+    ball_x = column("ball_x")
+    ball_y = column("ball_y")
+
+    # The columns of a player are looked up once
+    player_columns: Dict[Player, tuple] = {}
+    other_columns: Dict[Any, List] = {}
+
+    for i, frame in enumerate(frames):
+        period_id[i] = frame.period.id if frame.period else None
+        timestamp[i] = frame.timestamp
+        ball_state[i] = frame.ball_state.value if frame.ball_state else None
+        ball_owning_team_id[i] = (
+            frame.ball_owning_team.team_id if frame.ball_owning_team else None
+        )
+        if frame.ball_coordinates:
+            ball_x[i] = frame.ball_coordinates.x
+            ball_y[i] = frame.ball_coordinates.y
+        else:
+            ball_x[i] = ball_y[i] = None
+
+        for player, player_data in frame.players_data.items():
+            player_column = player_columns.get(player)
+            if player_column is None:
+                player_column = player_columns[player] = (
+                    column(f"{player.player_id}_x"),
+                    column(f"{player.player_id}_y"),
+                    column(f"{player.player_id}_d"),
+                    column(f"{player.player_id}_s"),
+                )
+            x, y, d, s = player_column
+            x[i] = player_data.coordinates.x
+            y[i] = player_data.coordinates.y
+            d[i] = player_data.distance
+            s[i] = player_data.speed
+
+            if player_data.other_data:
+                for name, value in player_data.other_data.items():
+                    key = (player, name)
+                    values = other_columns.get(key)
+                    if values is None:
+                        values = other_columns[key] = column(
+                            f"{player.player_id}_{name}"
+                        )
+                    values[i] = value
+
+        if frame.other_data:
+            for name, value in frame.other_data.items():
+                column(name)[i] = value
+
+        if i == 0 and additional_columns:
+            # Keep the column order of the row based conversion
+            for name in additional_columns:
+                column(name)
+
+    if additional_columns:
+        for name, value in additional_columns.items():
+            if callable(value):
+                columns[name] = [value(frame) for frame in frames]
+            else:
+                columns[name] = [value] * n
+
+    return columns
+
+
+# Columns of `dtypes="compact"` that aren't floats
+_COMPACT_DTYPES = {
+    "frame_id": "Int32",
+    "period_id": "Int8",
+    "ball_state": "category",
+    "ball_owning_team_id": "category",
+}
+
+# Columns that are float32 with `dtypes="compact"`, next to the columns of
+# the players in the wide layout
+_WIDE_FLOAT_COLUMNS = ["timestamp", "ball_x", "ball_y"]
+_LONG_FLOAT_COLUMNS = ["timestamp", "x", "y", "d", "s"]
+
+# Columns of the long layout
+LONG_COLUMNS = [
+    "frame_id",
+    "period_id",
+    "timestamp",
+    "player_id",
+    "team_id",
+    "jersey_no",
+    "position",
+    "x",
+    "y",
+    "d",
+    "s",
+]
+
+
+def _player_category_values(player: Player) -> Dict[str, Any]:
+    """
+    Values of the categorical columns of the long layout for a player
+    """
+    return {
+        "player_id": player.player_id,
+        "team_id": player.team.team_id if player.team else None,
+        "jersey_no": player.jersey_no,
+        "position": str(player.position.name) if player.position else None,
+    }
+
+
+def _long_categories(frames: Iterable[Frame]) -> Dict[str, List]:
+    """
+    Categories of the categorical columns of the long layout, in the order
+    `_frames_to_long_columns` finds them.
+    """
+    categories: Dict[str, Dict] = {
+        "player_id": {},
+        "team_id": {},
+        "jersey_no": {},
+        "position": {},
+    }
+    players = dict.fromkeys(
+        player for frame in frames for player in frame.players_data
+    )
+    for player in players:
+        for name, value in _player_category_values(player).items():
+            if value is not None:
+                categories[name].setdefault(value)
+    return {name: list(values) for name, values in categories.items()}
+
+
+def _frames_to_long_columns(
+    frames: List[Frame],
+) -> Tuple[Dict[str, "np.ndarray"], Dict[str, List]]:
+    """
+    Build the columns of the long layout: one row per frame and player in
+    `players_data`. The coordinates are copied into preallocated arrays in
+    one pass; all other columns are looked up per frame or per player.
+
+    Returns the columns and, for categorical columns, the categories (the
+    column itself holds the codes, -1 for None). `period_id` is a float
+    column with NaN for frames without a period. The `_frame_index` column
+    refers to the position of the frame of each row.
+    """
+    import numpy as np
+
+    n_frames = len(frames)
+    n_rows = sum(len(frame.players_data) for frame in frames)
+
+    frame_index = np.repeat(
+        np.arange(n_frames, dtype=np.int64),
+        [len(frame.players_data) for frame in frames],
+    )
+    player_codes = np.empty(n_rows, dtype=np.int32)
+    x = np.empty(n_rows, dtype=np.float64)
+    y = np.empty(n_rows, dtype=np.float64)
+    d = np.empty(n_rows, dtype=np.float64)
+    s = np.empty(n_rows, dtype=np.float64)
+
+    players: Dict[Player, int] = {}
+    nan = float("nan")
+    row = 0
+    for frame in frames:
+        for player, player_data in frame.players_data.items():
+            code = players.get(player)
+            if code is None:
+                code = players[player] = len(players)
+            player_codes[row] = code
+            x[row] = player_data.coordinates.x
+            y[row] = player_data.coordinates.y
+            d[row] = (
+                player_data.distance
+                if player_data.distance is not None
+                else nan
+            )
+            s[row] = (
+                player_data.speed if player_data.speed is not None else nan
+            )
+            row += 1
+
+    frame_ids = np.array([frame.frame_id for frame in frames], dtype=np.int64)
+    # NaN for frames without a period, like the missing values in the
+    # wide layout
+    period_ids = np.array(
+        [frame.period.id if frame.period else nan for frame in frames],
+        dtype=np.float64,
+    )
+    timestamps = np.array(
+        [frame.timestamp for frame in frames], dtype=np.float64
+    )
+
+    # Per player code the code of the player id, team, jersey and position
+    categories: Dict[str, List] = {
+        "player_id": [],
+        "team_id": [],
+        "jersey_no": [],
+        "position": [],
+    }
+    category_codes: Dict[str, Dict] = {name: {} for name in categories}
+    player_columns: Dict[str, List[int]] = {name: [] for name in categories}
+    for player in players:
+        for name, value in _player_category_values(player).items():
+            if value is None:
+                player_columns[name].append(-1)
+                continue
+            codes = category_codes[name]
+            code = codes.get(value)
+            if code is None:
+                code = codes[value] = len(categories[name])
+                categories[name].append(value)
+            player_columns[name].append(code)
+
+    columns = {
+        "frame_id": frame_ids[frame_index],
+        "period_id": period_ids[frame_index],
+        "timestamp": timestamps[frame_index],
+    }
+    for name in categories:
+        columns[name] = np.array(player_columns[name], dtype=np.int32)[
+            player_codes
+        ]
+    columns.update(x=x, y=y, d=d, s=s, _frame_index=frame_index)
+    return columns, categories
 
 
 __all__ = ["Frame", "TrackingDataset", "PlayerData"]
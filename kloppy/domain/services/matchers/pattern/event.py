@@ -1,7 +1,21 @@
+import multiprocessing
+import threading
 from collections import defaultdict
-from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
 from functools import partial
-from typing import Callable, Tuple, Dict, List, Iterator
+from itertools import count
+from typing import (
+    Callable,
+    Tuple,
+    Dict,
+    List,
+    Iterator,
+    Type,
+    Any,
+    Optional,
+    Mapping,
+)
 
 from kloppy.domain import (
     EventDataset,
@@ -13,49 +27,123 @@ from kloppy.domain import (
 )
 from .regexp import *
 from .regexp import _make_match, _TrailItem
-from .regexp.regexp import _Match
+from .regexp.regexp import _Match, Match as RegExpMatch
+
+
+@dataclass(frozen=True)
+class EventFilter:
+    """
+    Conditions on a single event that can be checked without looking at the
+    captures: the event class and attributes that must have a fixed value.
+    """
+
+    event_cls: Type[Event]
+    attributes: Dict[str, Any]
+
+    def __call__(self, event: Event) -> bool:
+        if not isinstance(event, self.event_cls):
+            return False
+
+        for attr_name, attr_value in self.attributes.items():
+            if attr_name == "success":
+                result = event.result and event.result.is_success
+            else:
+                result = getattr(event, attr_name) == attr_value
+            if not result:
+                return False
+        return True
+
+
+@dataclass(frozen=True)
+class CaptureReference:
+    """
+    Describes a predicate created by `same_as` or `not_same_as`: the value
+    of an attribute must (not) be the same as `attribute_name` of the
+    captured event `capture_name`.
+    """
+
+    capture_name: str
+    attribute_name: str
+    same: bool
 
 
 class WithCaptureMatcher(Matcher):
-    def __init__(self, matcher: Callable[[Tok, Dict[str, List[Tok]]], bool]):
+    """
+    Calls `matcher` with the token and the first event of every capture.
+    Captures that start at the token itself are None.
+    """
+
+    def __init__(
+        self,
+        matcher: Callable[[Tok, Mapping[str, Optional[Tok]]], bool],
+        event_filter: Optional[EventFilter] = None,
+        references: Optional[Dict[str, CaptureReference]] = None,
+    ):
         self.matcher = matcher
+        # Necessary condition for `matcher` to match, when known
+        self.event_filter = event_filter
+        # Conditions on attributes that refer to captures, when known
+        self.references = references or {}
 
-    def _add_captures(self, captures: Dict[str, List[Tok]], match: _Match):
+    def _add_captures(self, captures: Dict[str, Tok], match: _Match):
         for name, capture in match.children.items():
-            captures[name] = capture[0].trail
+            trail = capture[0].trail
+            captures[name] = trail[0] if trail else None
             self._add_captures(captures, capture[0])
 
     def match(
         self, token: Tok, trail: Tuple[_TrailItem[Out], ...]
     ) -> Iterator[Out]:
-        match = _make_match(trail)
-        captures = {}
-        self._add_captures(captures, match)
+        # The trail passed by the engine keeps track of the captures, only
+        # rebuild them from the trail when it doesn't.
+        captures = getattr(trail, "captures", None)
+        if captures is None:
+            captures = {}
+            self._add_captures(captures, _make_match(trail))
+
         if self.matcher(token, captures):
             yield token
 
 
 def match_generic(event_cls, capture=None, **kwargs):
-    def _matcher_fn(event: Event, captures: Dict[str, List[Event]]) -> bool:
-        if not isinstance(event, event_cls):
+    event_filter = EventFilter(
+        event_cls=event_cls,
+        attributes={
+            attr_name: attr_value
+            for attr_name, attr_value in kwargs.items()
+            if not callable(attr_value)
+        },
+    )
+    predicates = {
+        attr_name: attr_value
+        for attr_name, attr_value in kwargs.items()
+        if callable(attr_value)
+    }
+
+    def _matcher_fn(event: Event, captures: Mapping[str, Event]) -> bool:
+        if not event_filter(event):
             return False
 
-        # TODO: v[0] points to first record
-        captures = {k: v[0] for k, v in captures.items()}
-        for attr_name, attr_value in kwargs.items():
-            if callable(attr_value):
-                attr_real_value = getattr(event, attr_name)
-                result = attr_value(attr_name, attr_real_value, captures)
-            else:
-                if attr_name == "success":
-                    result = event.result and event.result.is_success
-                else:
-                    result = getattr(event, attr_name) == attr_value
-            if not result:
+        # TODO: captures only hold the first event of every capture
+        for attr_name, predicate in predicates.items():
+            attr_real_value = getattr(event, attr_name)
+            if not predicate(attr_name, attr_real_value, captures):
                 return False
         return True
 
-    _matcher = Final(WithCaptureMatcher(matcher=_matcher_fn))
+    _matcher = Final(
+        WithCaptureMatcher(
+            matcher=_matcher_fn,
+            event_filter=event_filter,
+            references={
+                attr_name: predicate.reference
+                for attr_name, predicate in predicates.items()
+                if isinstance(
+                    getattr(predicate, "reference", None), CaptureReference
+                )
+            },
+        )
+    )
 
     if capture:
         return _matcher[capture]
@@ -76,6 +164,7 @@ def same_as(capture: str):
     def fn(attr_name, value, captures):
         return value == getattr(captures[capture_name], attribute_name)
 
+    fn.reference = CaptureReference(capture_name, attribute_name, same=True)
     return fn
 
 
@@ -85,10 +174,148 @@ def not_same_as(capture: str):
     def fn(attr_name, value, captures):
         return value != getattr(captures[capture_name], capture_attribute_name)
 
+    fn.reference = CaptureReference(
+        capture_name, capture_attribute_name, same=False
+    )
     return fn
 
 
-def group(node, capture=None):
+# Prefix of the names of captures that are added by `group` to implement a
+# window. They are not exposed to matchers nor in the results.
+_INTERNAL_CAPTURE_PREFIX = "__window_"
+_window_ids = count()
+
+
+def _is_internal_capture(name: str) -> bool:
+    return name.startswith(_INTERNAL_CAPTURE_PREFIX)
+
+
+class WindowMatcher(Matcher):
+    """
+    Only lets `matcher` match when the event lies within the window of the
+    enclosing (internal) capture `capture_name`.
+    """
+
+    def __init__(
+        self,
+        matcher: Matcher,
+        capture_name: str,
+        max_duration: Optional[float] = None,
+        max_events: Optional[int] = None,
+    ):
+        self.matcher = matcher
+        self.capture_name = capture_name
+        self.max_duration = max_duration
+        self.max_events = max_events
+        # The window doesn't restrict the first event of the group, so the
+        # filter and references of the wrapped matcher still apply.
+        self.event_filter = getattr(matcher, "event_filter", None)
+        self.references = getattr(matcher, "references", {})
+
+    def _window_start(
+        self, trail: Tuple[_TrailItem[Out], ...]
+    ) -> Optional[Tuple[Optional[Event], int]]:
+        """
+        First event and size (including the current token) of the open
+        capture of this window, or None when the capture is not open.
+        """
+        open_captures = getattr(trail, "open_captures", None)
+        if open_captures is not None:
+            for capture in open_captures:
+                if capture.name == self.capture_name:
+                    return capture.first, trail.pos - capture.start + 1
+            return None
+
+        # The trail contains a placeholder (None) for the current token
+        match = _make_match(trail)
+        keys = []
+        for capture in match._stack:
+            keys.append(capture)
+            if capture.name == self.capture_name:
+                events = match._deep_get(keys).trail
+                return events[0], len(events)
+        return None
+
+    def _in_window(
+        self, token: Event, trail: Tuple[_TrailItem[Out], ...]
+    ) -> bool:
+        window_start = self._window_start(trail)
+        if window_start is None:
+            return True
+
+        first_event, size = window_start
+        if self.max_events is not None and size > self.max_events:
+            return False
+        if self.max_duration is not None and first_event is not None:
+            if token.timestamp - first_event.timestamp > self.max_duration:
+                return False
+        return True
+
+    def match(
+        self, token: Tok, trail: Tuple[_TrailItem[Out], ...]
+    ) -> Iterator[Out]:
+        if self._in_window(token, trail):
+            yield from self.matcher.match(token, trail)
+
+
+def _map_finals(node: Node, fn: Callable[[Matcher], Matcher]) -> Node:
+    """
+    Returns a copy of `node` in which the matcher of every Final is replaced
+    by `fn(matcher)`.
+    """
+
+    if isinstance(node, Final):
+        return replace(node, statement=fn(node.statement))
+    elif isinstance(node, (Concatenation, Alternation)):
+        return replace(
+            node,
+            left=_map_finals(node.left, fn),
+            right=_map_finals(node.right, fn),
+        )
+    elif isinstance(node, (Maybe, AnyNumber, Capture)):
+        return replace(node, statement=_map_finals(node.statement, fn))
+    else:
+        raise TypeError(f"Unknown node type {type(node)}")
+
+
+def group(
+    node,
+    capture=None,
+    max_duration: Optional[float] = None,
+    max_events: Optional[int] = None,
+):
+    """
+    Groups a sub-pattern, optionally capturing it.
+
+    Arguments:
+        - node: the sub-pattern
+        - capture: name of the capture
+        - max_duration: maximum number of seconds between the first and the
+            last event of the group
+        - max_events: maximum number of events in the group
+
+    Examples:
+        >>> pattern = (
+        >>>     match_pass(capture="first_pass")
+        >>>     + group(
+        >>>         match_pass(team=same_as("first_pass.team"))
+        >>>         * slice(None, None),
+        >>>         max_events=5,
+        >>>     )
+        >>> )
+    """
+    if max_duration is not None or max_events is not None:
+        capture_name = f"{_INTERNAL_CAPTURE_PREFIX}{next(_window_ids)}"
+        node = _map_finals(
+            node,
+            lambda matcher: WindowMatcher(
+                matcher,
+                capture_name=capture_name,
+                max_duration=max_duration,
+                max_events=max_events,
+            ),
+        )[capture_name]
+
     if capture:
         return node[capture]
     return node
@@ -99,7 +326,7 @@ def function(fn):
         capture_values = {
             f"{capture_name}_{attr_name}": getattr(capture_value, attr_name)
             for capture_name, capture_value in captures.items()
-            if capture_value
+            if capture_value and not _is_internal_capture(capture_name)
         }
         return fn(value, **capture_values)
 
@@ -112,52 +339,354 @@ class Match:
     captures: Dict[str, List[Event]]
 
 
-def search(dataset: EventDataset, pattern: Node[Tok, Out]):
-    events = dataset.events
+def search(
+    dataset: EventDataset,
+    pattern: Node[Tok, Out],
+    max_duration: Optional[float] = None,
+    max_events: Optional[int] = None,
+    mode: str = "all",
+    n_workers: Optional[int] = None,
+):
+    """
+    Search for all matches of `pattern` in the dataset.
+
+    Arguments:
+        - dataset:
+        - pattern:
+        - max_duration: maximum number of seconds between the first and the
+            last event of a match. Matches are not extended beyond this
+            window, which bounds the work per start position.
+        - max_events: maximum number of events in a match
+        - mode: "all" returns the longest match for every event at which
+            the pattern matches, so matches can overlap. "non_overlapping"
+            only returns the leftmost-longest matches: after a match the
+            search continues after its last event.
+        - n_workers: search the periods in this number of processes. See
+            `search_datasets`.
+
+    Use `group(..., max_duration=..., max_events=...)` to put a window on a
+    part of the pattern.
+    """
+    return search_datasets(
+        [dataset],
+        pattern,
+        max_duration=max_duration,
+        max_events=max_events,
+        mode=mode,
+        n_workers=n_workers,
+    )[0]
+
+
+def search_datasets(
+    datasets: List[EventDataset],
+    pattern: Node[Tok, Out],
+    max_duration: Optional[float] = None,
+    max_events: Optional[int] = None,
+    mode: str = "all",
+    n_workers: Optional[int] = None,
+) -> List[List["Match"]]:
+    """
+    Search for all matches of `pattern` in several datasets.
+
+    Arguments:
+        - datasets:
+        - pattern:
+        - max_duration: see `search`
+        - max_events: see `search`
+        - mode: see `search`
+        - n_workers: number of processes to use. Every period of every
+            dataset is searched separately, so the work is distributed per
+            period. The worker processes are forked from the current
+            process: the compiled pattern and the events are not pickled,
+            only the positions of the matches are sent back. Platforms that
+            can't fork search in the current process.
+
+    Returns:
+        For every dataset the same matches as `search` would return. The
+        matches refer to the events of the original datasets.
+
+    Examples:
+        >>> results = search_datasets(datasets, pattern, n_workers=4)
+    """
     re = RegExp.from_ast(pattern)
 
-    results = []
-    events_per_period = defaultdict(list)
-    for event in events:
-        events_per_period[event.period.id].append(event)
+    # Search per period. Patterns should never match over periods
+    units = []
+    for dataset_idx, dataset in enumerate(datasets):
+        for events_ in _events_per_period(dataset.events):
+            units.append((dataset_idx, events_))
+
+    search_unit = partial(
+        _search_unit,
+        re=re,
+        max_duration=max_duration,
+        max_events=max_events,
+        mode=mode,
+    )
+    if (
+        n_workers is not None
+        and n_workers > 1
+        and len(units) > 1
+        and "fork" in multiprocessing.get_all_start_methods()
+    ):
+        unit_results = _search_units_parallel(units, search_unit, n_workers)
+    else:
+        unit_results = [search_unit(events_) for _, events_ in units]
 
-    for period, events_ in sorted(events_per_period.items()):
-        # Search per period. Patterns should never match over periods
-        results.extend(_search(events_, re))
+    results = [[] for _ in datasets]
+    for (dataset_idx, events_), matches in zip(units, unit_results):
+        results[dataset_idx].extend(
+            _decode_match(events_, match) for match in matches
+        )
     return results
 
 
-def _search(events: List[Event], re: RegExp[Tok, Out]):
-    i = 0
-    results = []
-    for i in range(len(events)):
-        matches = re.match(events[i:], consume_all=False)
-        if matches:
-            results.append(
-                Match(
-                    events=matches[0].trail,
-                    # TODO: check trail[0] because this points to the first event in the capture and not
-                    #       all of them
-                    captures={
-                        capture_name: capture_value[0].trail[0]
-                        for capture_name, capture_value in matches[
-                            0
-                        ].children.items()
-                    },
+def _search_unit(
+    events: List[Event],
+    re: RegExp[Tok, Out],
+    max_duration: Optional[float],
+    max_events: Optional[int],
+    mode: str,
+    starts: Optional[List[int]] = None,
+) -> List[Tuple[int, int, Dict[str, int]]]:
+    window = _window(events, max_duration, max_events)
+    if starts is None:
+        starts = _candidate_starts(events, re)
+    return [
+        _encode_match(match)
+        for match in re.search(
+            events,
+            starts=starts,
+            window=window,
+            mode=mode,
+        )
+    ]
+
+
+# Search state inherited by the forked worker processes, per call of
+# `_search_units_parallel` so searches from several threads don't interfere
+_PARALLEL_SEARCHES: Dict[int, Tuple[List[List[Event]], Callable]] = {}
+_PARALLEL_SEARCHES_LOCK = threading.Lock()
+_parallel_search_keys = count()
+
+
+def _search_unit_in_worker(key: int, unit_idx: int):
+    units, search_unit = _PARALLEL_SEARCHES[key]
+    return search_unit(units[unit_idx])
+
+
+def _search_units_parallel(
+    units: List[Tuple[int, List[Event]]],
+    search_unit: Callable,
+    n_workers: int,
+) -> List[List[Tuple[int, int, Dict[str, int]]]]:
+    # Patterns hold closures (see `same_as`) that can't be pickled. Instead,
+    # the workers are forked after the search state is set up.
+    with _PARALLEL_SEARCHES_LOCK:
+        key = next(_parallel_search_keys)
+        _PARALLEL_SEARCHES[key] = (
+            [events_ for _, events_ in units],
+            search_unit,
+        )
+    try:
+        with ProcessPoolExecutor(
+            max_workers=min(n_workers, len(units)),
+            mp_context=multiprocessing.get_context("fork"),
+        ) as executor:
+            return list(
+                executor.map(
+                    partial(_search_unit_in_worker, key), range(len(units))
                 )
             )
-
+    finally:
+        with _PARALLEL_SEARCHES_LOCK:
+            del _PARALLEL_SEARCHES[key]
+
+
+def _encode_match(match: RegExpMatch[Out]) -> Tuple[int, int, Dict[str, int]]:
+    """
+    Describes a match by positions only, so it can be sent between processes
+    """
+    return (
+        match.start_pos,
+        len(match.trail),
+        {
+            capture_name: capture_value[0].start_pos
+            for capture_name, capture_value in _public_captures(match)
+        },
+    )
+
+
+def _decode_match(
+    events: List[Event], encoded: Tuple[int, int, Dict[str, int]]
+) -> "Match":
+    start_pos, length, captures = encoded
+    return Match(
+        events=tuple(events[start_pos : start_pos + length]),
+        captures={
+            capture_name: events[capture_pos]
+            for capture_name, capture_pos in captures.items()
+        },
+    )
+
+
+def search_many(
+    dataset: EventDataset,
+    patterns: Dict[str, Node[Tok, Out]],
+    max_duration: Optional[float] = None,
+    max_events: Optional[int] = None,
+    mode: str = "all",
+) -> Dict[str, List["Match"]]:
+    """
+    Search for several patterns at once. All patterns are compiled into one
+    automaton and advanced together, so the events of every period are
+    traversed only once.
+
+    Arguments:
+        - dataset:
+        - patterns: mapping from name to pattern
+        - max_duration: see `search`
+        - max_events: see `search`
+        - mode: see `search`. In "non_overlapping" mode matches of
+            different patterns don't overlap either: when several patterns
+            match at the same event, only the longest match is kept (of the
+            first of those patterns when they are equally long).
+
+    Returns:
+        The matches of every pattern, keyed by the name of the pattern. In
+        "all" mode the matches of a pattern are the same as returned by
+        `search`.
+
+    Examples:
+        >>> results = search_many(
+        >>>     dataset,
+        >>>     {
+        >>>         "pass_shot": match_pass() + match_shot(),
+        >>>         "carry_shot": match_carry() + match_shot(),
+        >>>     },
+        >>> )
+        >>> results["pass_shot"]
+    """
+    names = list(patterns)
+    re = RegExp.combine([RegExp.from_ast(patterns[name]) for name in names])
+
+    results = {name: [] for name in names}
+    for events_ in _events_per_period(dataset.events):
+        starts = _candidate_starts(events_, re)
+        window = _window(events_, max_duration, max_events)
+        for owner, match in re.search_each(
+            events_, starts=starts, window=window, mode=mode
+        ):
+            results[names[owner]].append(_make_event_match(match))
     return results
 
 
+def _events_per_period(events: List[Event]) -> List[List[Event]]:
+    events_per_period = defaultdict(list)
+    for event in events:
+        events_per_period[event.period.id].append(event)
+
+    return [events_ for period, events_ in sorted(events_per_period.items())]
+
+
+def _window(
+    events: List[Event],
+    max_duration: Optional[float] = None,
+    max_events: Optional[int] = None,
+) -> Optional[Callable[[int, int], bool]]:
+    """
+    Returns the window for `RegExp.search`: whether the event at `pos` may
+    still be part of a match that starts at `start_pos`.
+    """
+    if max_duration is None and max_events is None:
+        return None
+
+    def window(start_pos: int, pos: int) -> bool:
+        if max_events is not None and pos - start_pos >= max_events:
+            return False
+        if max_duration is not None and (
+            events[pos].timestamp - events[start_pos].timestamp > max_duration
+        ):
+            return False
+        return True
+
+    return window
+
+
+def _start_filters(re: RegExp[Tok, Out]) -> Optional[List[EventFilter]]:
+    """
+    Returns the filters of all matchers that can consume the first event of
+    a match, or None when at least one of them can't be described by a
+    filter.
+    """
+
+    filters = []
+    for matcher in re.first_matchers:
+        event_filter = getattr(matcher, "event_filter", None)
+        if event_filter is None:
+            return None
+        if event_filter not in filters:
+            filters.append(event_filter)
+    return filters
+
+
+def _candidate_starts(
+    events: List[Event], re: RegExp[Tok, Out]
+) -> Optional[List[int]]:
+    """
+    Index of the positions at which a match can start. Returns None when
+    every position is a candidate.
+    """
+
+    filters = _start_filters(re)
+    if filters is None:
+        return None
+
+    return [
+        i
+        for i, event in enumerate(events)
+        if any(event_filter(event) for event_filter in filters)
+    ]
+
+
+def _make_event_match(match: RegExpMatch[Out]) -> "Match":
+    return Match(
+        events=match.trail,
+        # TODO: check trail[0] because this points to the first event in the capture and not
+        #       all of them
+        captures={
+            capture_name: capture_value[0].trail[0]
+            for capture_name, capture_value in _public_captures(match)
+        },
+    )
+
+
+def _public_captures(
+    match: RegExpMatch[Out],
+) -> Iterator[Tuple[str, MatchList]]:
+    """
+    Yields the captures of `match`. The captures inside of an internal
+    capture are yielded in place of the internal capture itself.
+    """
+    for capture_name, capture_value in match.children.items():
+        if _is_internal_capture(capture_name):
+            yield from _public_captures(capture_value[0])
+        else:
+            yield capture_name, capture_value
+
+
 @dataclass
 class Query:
     event_types: List[str]
     pattern: Node[Tok, Out]
+    max_duration: Optional[float] = None
+    max_events: Optional[int] = None
 
 
 __all__ = [
     "search",
+    "search_many",
+    "search_datasets",
     "match_pass",
     "match_carry",
     "match_take_on",
@@ -0,0 +1,352 @@
+import gzip
+import json
+from dataclasses import dataclass
+from typing import (
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from kloppy.domain import Event, EventDataset, EventType
+from kloppy.exceptions import KloppyError
+
+from .event import (
+    Match,
+    _decode_match,
+    _events_per_period,
+    _search_unit,
+)
+from .regexp import Node, Out, RegExp, Tok
+from .regexp.regexp import _Automaton, _Transition
+
+# Postings of a key: match id -> period id -> positions of the first event
+# of the n-gram within the events of the period.
+Postings = Dict[str, Dict[int, List[int]]]
+
+INDEX_VERSION = 1
+
+
+def _ngram_keys(events: List[Event], pos: int, n: int) -> Tuple[str, str]:
+    """
+    Returns the event type key and the team-relative key of the n-gram that
+    starts at `pos`. In the team-relative key every event type is suffixed
+    with /S when the event is of the same team as the first event of the
+    n-gram, and /O otherwise.
+    """
+    first_team = events[pos].team
+    types = []
+    relative_types = []
+    for event in events[pos : pos + n]:
+        event_type = event.event_type.value
+        types.append(event_type)
+        relative_types.append(
+            f"{event_type}/{'S' if event.team == first_team else 'O'}"
+        )
+    return " ".join(types), " ".join(relative_types)
+
+
+@dataclass
+class EventIndex:
+    """
+    Inverted index of the event type n-grams of a collection of matches.
+
+    Every n-gram (of length 1 up to `n`) is indexed twice: by its event
+    types, and by its event types relative to the team of its first event.
+    The postings point to the position of the first event of the n-gram in
+    the events of a period, as grouped by `search`.
+
+    Use `build_index` to create an index and `search_index` to search in it.
+    """
+
+    n: int
+    # match id -> period id -> number of events
+    matches: Dict[str, Dict[int, int]]
+    postings: Dict[str, Postings]
+
+    def lookup(self, keys: Iterable[str]) -> Postings:
+        """
+        Returns the union of the postings of `keys`.
+        """
+        result: Dict[str, Dict[int, Set[int]]] = {}
+        for key in keys:
+            for match_id, periods in self.postings.get(key, {}).items():
+                match_result = result.setdefault(match_id, {})
+                for period_id, positions in periods.items():
+                    match_result.setdefault(period_id, set()).update(positions)
+
+        return {
+            match_id: {
+                period_id: sorted(positions)
+                for period_id, positions in periods.items()
+            }
+            for match_id, periods in result.items()
+        }
+
+    def save(self, path: str):
+        with gzip.open(path, "wt", encoding="utf-8") as fp:
+            json.dump(
+                {
+                    "version": INDEX_VERSION,
+                    "n": self.n,
+                    "matches": self.matches,
+                    "postings": self.postings,
+                },
+                fp,
+                separators=(",", ":"),
+            )
+
+    @classmethod
+    def load(cls, path: str) -> "EventIndex":
+        with gzip.open(path, "rt", encoding="utf-8") as fp:
+            data = json.load(fp)
+
+        if data.get("version") != INDEX_VERSION:
+            raise KloppyError(
+                f"Unsupported event index version: {data.get('version')}"
+            )
+
+        # JSON only has string keys
+        return cls(
+            n=data["n"],
+            matches={
+                match_id: {
+                    int(period_id): n_events
+                    for period_id, n_events in periods.items()
+                }
+                for match_id, periods in data["matches"].items()
+            },
+            postings={
+                key: {
+                    match_id: {
+                        int(period_id): positions
+                        for period_id, positions in periods.items()
+                    }
+                    for match_id, periods in postings.items()
+                }
+                for key, postings in data["postings"].items()
+            },
+        )
+
+
+def build_index(
+    datasets: Mapping[str, EventDataset], n: int = 3
+) -> EventIndex:
+    """
+    Build an inverted index of event type n-grams.
+
+    Arguments:
+        - datasets: mapping from match id to dataset. The datasets must be
+            loaded the same way as `search_index` will load them (same
+            provider, same `event_types`), because the index refers to
+            positions in the events.
+        - n: maximum length of the n-grams
+
+    Examples:
+        >>> index = build_index({"match_1": dataset_1, "match_2": dataset_2})
+        >>> index.save("index.json.gz")
+    """
+    if n < 1:
+        raise ValueError("n must be at least 1")
+
+    matches = {}
+    postings: Dict[str, Postings] = {}
+    for match_id, dataset in datasets.items():
+        match_id = str(match_id)
+        matches[match_id] = {}
+        for events in _events_per_period(dataset.events):
+            period_id = events[0].period.id
+            matches[match_id][period_id] = len(events)
+            for pos in range(len(events)):
+                for length in range(1, min(n, len(events) - pos) + 1):
+                    for key in _ngram_keys(events, pos, length):
+                        postings.setdefault(key, {}).setdefault(
+                            match_id, {}
+                        ).setdefault(period_id, []).append(pos)
+
+    return EventIndex(n=n, matches=matches, postings=postings)
+
+
+# A step of a query plan: the event type of an event, and whether it's of
+# the same team ("S") as the first event of the match, the other team ("O")
+# or unknown (None).
+_Step = Tuple[str, Optional[str]]
+
+
+def _plan_step(
+    transition: _Transition, first_captures: FrozenSet[str]
+) -> Optional[_Step]:
+    """
+    Describes the events a transition can consume, or returns None when it
+    can consume any event type.
+    """
+    event_filter = getattr(transition.matcher, "event_filter", None)
+    if event_filter is None:
+        return None
+
+    # Event subclasses have their type as default value of `event_type`
+    event_type = getattr(event_filter.event_cls, "event_type", None)
+    if not isinstance(event_type, EventType):
+        return None
+
+    relation = None
+    reference = getattr(transition.matcher, "references", {}).get("team")
+    if (
+        reference is not None
+        and reference.attribute_name == "team"
+        and reference.capture_name in first_captures
+    ):
+        relation = "S" if reference.same else "O"
+
+    return event_type.value, relation
+
+
+def _plan_key(steps: List[_Step]) -> str:
+    if all(relation for _, relation in steps[1:]):
+        # The first event is always of its own team
+        return " ".join(
+            f"{event_type}/{relation if i else 'S'}"
+            for i, (event_type, relation) in enumerate(steps)
+        )
+    return " ".join(event_type for event_type, _ in steps)
+
+
+class _Unplannable(Exception):
+    pass
+
+
+def _plan(automaton: _Automaton, n: int) -> Optional[Set[str]]:
+    """
+    Returns index keys such that every match of the automaton starts at an
+    n-gram with one of these keys, or None when the index can't be used.
+
+    All paths of the automaton are followed for up to `n` transitions. A
+    path is cut short where a match can end, or where the next event can be
+    of any type.
+    """
+    keys = set()
+
+    def visit(state: int, steps: List[_Step], first_captures: FrozenSet[str]):
+        transitions = automaton.transitions[state]
+        if steps and (len(steps) == n or automaton.accepting[state]):
+            keys.add(_plan_key(steps))
+            return
+
+        next_steps = []
+        for transition in transitions:
+            captures = first_captures
+            started = {
+                capture.name
+                for capture in transition.data.get("start_captures", [])
+            }
+            if not steps:
+                # Captures that start at the first event of the match
+                captures = frozenset(started)
+            else:
+                # A capture that starts again no longer refers to the first
+                # event of the match
+                captures = captures - started
+
+            step = _plan_step(transition, captures)
+            if step is None:
+                if not steps:
+                    raise _Unplannable()
+                keys.add(_plan_key(steps))
+                return
+            next_steps.append((transition.target, step, captures))
+
+        for target, step, captures in next_steps:
+            visit(target, steps + [step], captures)
+
+    if automaton.accepting[0]:
+        return None
+
+    try:
+        visit(0, [], frozenset())
+    except _Unplannable:
+        return None
+    return keys
+
+
+def search_index(
+    index: EventIndex,
+    pattern: Node[Tok, Out],
+    load_dataset: Callable[[str], EventDataset],
+    max_duration: Optional[float] = None,
+    max_events: Optional[int] = None,
+    mode: str = "all",
+) -> Dict[str, List[Match]]:
+    """
+    Search for all matches of `pattern` in the matches of an index. Only
+    matches that contain a candidate n-gram are loaded, and within those
+    matches the pattern is only tried at the candidate positions.
+
+    Arguments:
+        - index: see `build_index`
+        - pattern:
+        - load_dataset: function that loads the dataset of a match id
+        - max_duration: see `search`
+        - max_events: see `search`
+        - mode: see `search`
+
+    Returns:
+        Per loaded match id, the same matches as `search` would return.
+
+    Examples:
+        >>> index = EventIndex.load("index.json.gz")
+        >>> results = search_index(
+        >>>     index,
+        >>>     match_pass() + match_take_on() + match_shot(),
+        >>>     load_dataset=lambda match_id: statsbomb.load(...),
+        >>> )
+    """
+    re = RegExp.from_ast(pattern)
+
+    keys = _plan(re.automaton, index.n)
+    if keys is None:
+        # Every position is a candidate
+        candidates = {match_id: None for match_id in index.matches}
+    else:
+        candidates = index.lookup(keys)
+
+    results = {}
+    for match_id, periods in candidates.items():
+        dataset = load_dataset(match_id)
+
+        matches = []
+        for events in _events_per_period(dataset.events):
+            period_id = events[0].period.id
+            if index.matches[match_id].get(period_id) != len(events):
+                raise KloppyError(
+                    f"Dataset of match {match_id} doesn't match the index. "
+                    f"Make sure it's loaded the same way as when the index "
+                    f"was built."
+                )
+
+            starts = None
+            if periods is not None:
+                starts = periods.get(period_id)
+                if not starts:
+                    continue
+
+            matches.extend(
+                _decode_match(events, match)
+                for match in _search_unit(
+                    events,
+                    re,
+                    max_duration=max_duration,
+                    max_events=max_events,
+                    mode=mode,
+                    starts=starts,
+                )
+            )
+        results[match_id] = matches
+    return results
+
+
+__all__ = ["EventIndex", "build_index", "search_index"]
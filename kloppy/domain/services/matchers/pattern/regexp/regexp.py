@@ -1,18 +1,24 @@
-from dataclasses import dataclass
+from collections import deque
+from dataclasses import dataclass, field
 from itertools import product
 from types import MappingProxyType
 from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
     Dict,
     Generic,
+    Hashable,
+    Iterable,
     Iterator,
     List,
     Mapping,
+    Optional,
     Sequence,
     Text,
     Tuple,
 )
-
-import networkx as nx
+from weakref import WeakKeyDictionary
 
 # noinspection PyProtectedMember
 from .ast import (
@@ -26,10 +32,89 @@ from .ast import (
     _Initial,
     _Terminal,
 )
-from .matchers import Out, Tok, _TrailItem
+from .matchers import Matcher, Out, Tok, _TrailItem
+
+if TYPE_CHECKING:
+    import networkx as nx
 
 
-def ast_to_graph(root: Node) -> nx.DiGraph:
+class _DiGraph:
+    """
+    Minimal directed graph, implementing the subset of the
+    `networkx.DiGraph` API that is used to turn an AST into a graph. Edge
+    data dicts are shared between the successor and predecessor views, just
+    like in networkx.
+
+    This allows compiling a regular expression without depending on
+    networkx, which is only needed to visualise the graph.
+    """
+
+    def __init__(self):
+        self._succ: Dict[Node, Dict[Node, Dict]] = {}
+        self._pred: Dict[Node, Dict[Node, Dict]] = {}
+
+    @property
+    def nodes(self) -> List[Node]:
+        return list(self._succ)
+
+    def add_node(self, node: Node) -> None:
+        if node not in self._succ:
+            self._succ[node] = {}
+            self._pred[node] = {}
+
+    def add_nodes_from(self, nodes: Iterable[Node]) -> None:
+        for node in nodes:
+            self.add_node(node)
+
+    def add_edge(self, u: Node, v: Node, **data) -> None:
+        self.add_node(u)
+        self.add_node(v)
+
+        edge_data = self._succ[u].get(v, {})
+        edge_data.update(data)
+        self._succ[u][v] = edge_data
+        self._pred[v][u] = edge_data
+
+    def remove_node(self, node: Node) -> None:
+        for s in self._succ[node]:
+            del self._pred[s][node]
+        del self._succ[node]
+
+        for p in self._pred[node]:
+            del self._succ[p][node]
+        del self._pred[node]
+
+    def predecessors(self, node: Node) -> Iterator[Node]:
+        return iter(self._pred[node])
+
+    def successors(self, node: Node) -> Iterator[Node]:
+        return iter(self._succ[node])
+
+    def get_edge_data(self, u: Node, v: Node, default: Dict = None) -> Dict:
+        try:
+            return self._succ[u][v]
+        except KeyError:
+            return default
+
+    def has_successor(self, u: Node, v: Node) -> bool:
+        return u in self._succ and v in self._succ[u]
+
+    def edges(self) -> Iterator[Tuple[Node, Node, Dict]]:
+        for u, successors in self._succ.items():
+            for v, data in successors.items():
+                yield u, v, data
+
+    def to_networkx(self) -> "nx.DiGraph":
+        import networkx as nx
+
+        g = nx.DiGraph()
+        g.add_nodes_from(self.nodes)
+        for u, v, data in self.edges():
+            g.add_edge(u, v, **data)
+        return g
+
+
+def ast_to_graph(root: Node) -> "nx.DiGraph":
     """
     You will create your regular expression with a specific syntax which is
     transformed into an AST, however the regular expression engine expects
@@ -85,13 +170,25 @@ def ast_to_graph(root: Node) -> nx.DiGraph:
     order, of capture groups to start or stop. The capture should start right
     after the start and before the stop marker.
 
+    This function returns a `networkx.DiGraph`, which is useful for debugging
+    and visualisation. The matching engine itself doesn't need networkx:
+    it compiles the graph into transition tables (see `_compile()`).
+
     See Also
     --------
     _explore_concatenation, _explore_alternation, _explore_maybe,
     _explore_any_number, _explore_capture
     """
 
-    g = nx.DiGraph()
+    return _build_graph(root, _DiGraph()).to_networkx()
+
+
+def _build_graph(root: Node, g: _DiGraph) -> _DiGraph:
+    """
+    Does the actual work of `ast_to_graph()`, inserting the nodes and edges
+    into the provided graph.
+    """
+
     initial = _Initial()
     terminal = _Terminal()
 
@@ -294,48 +391,431 @@ def _explore_concatenation(explore, g, node):
     g.remove_node(node)
 
 
+@dataclass(frozen=True)
+class _Transition:
+    """
+    Edge of the compiled automaton: consuming a token that is accepted by
+    `matcher` moves to state `target`. `data` holds the capture flags of the
+    edge (see `ast_to_graph()`).
+    """
+
+    target: int
+    matcher: Matcher
+    data: Dict[Text, Sequence[Capture]]
+
+
+@dataclass(frozen=True)
+class _Automaton:
+    """
+    Regular expression graph compiled into integer states. State 0 is the
+    initial state, all other states correspond to a `Final` node.
+
+    - `transitions[state]` holds all outgoing edges of a state
+    - `accepting[state]` tells if the state is connected to the terminal
+    - `owners[state]` is the index of the regular expression a state belongs
+      to, when several expressions are combined (see `_combine()`)
+    """
+
+    transitions: Tuple[Tuple[_Transition, ...], ...]
+    accepting: Tuple[bool, ...]
+    owners: Tuple[int, ...]
+
+
+def _compile(g: _DiGraph) -> _Automaton:
+    """
+    Compiles the graph generated by `_build_graph()` into transition tables.
+
+    Edge data dicts with the same capture flags are replaced by one shared
+    dict, so explorers can compare them by identity.
+    """
+
+    terminal = _Terminal()
+    states = [_Initial()] + [
+        node for node in g.nodes if isinstance(node, Final)
+    ]
+    state_ids = {node: i for i, node in enumerate(states)}
+
+    edge_data: Dict[Tuple, Dict[Text, Sequence[Capture]]] = {}
+
+    def _canonical_data(data: Dict) -> Dict[Text, Sequence[Capture]]:
+        start_captures = tuple(data.get("start_captures", ()))
+        stop_captures = tuple(data.get("stop_captures", ()))
+        key = (start_captures, stop_captures)
+        if key not in edge_data:
+            canonical = {}
+            if start_captures:
+                canonical["start_captures"] = list(start_captures)
+            if stop_captures:
+                canonical["stop_captures"] = list(stop_captures)
+            edge_data[key] = canonical
+        return edge_data[key]
+
+    transitions = []
+    accepting = []
+    for node in states:
+        transitions.append(
+            tuple(
+                _Transition(
+                    target=state_ids[s],
+                    matcher=s.statement,
+                    data=_canonical_data(g.get_edge_data(node, s)),
+                )
+                for s in g.successors(node)
+                if isinstance(s, Final)
+            )
+        )
+        accepting.append(g.has_successor(node, terminal))
+
+    return _Automaton(
+        transitions=tuple(transitions),
+        accepting=tuple(accepting),
+        owners=(0,) * len(states),
+    )
+
+
+def _combine_graphs(graphs: Sequence[_DiGraph]) -> _DiGraph:
+    """
+    Combines the graphs of several expressions into one. The initial
+    (and terminal) nodes of all graphs are equal, so the result has a single
+    initial node from which all expressions branch off.
+    """
+
+    combined = _DiGraph()
+    for graph in graphs:
+        combined.add_nodes_from(graph.nodes)
+        for u, v, data in graph.edges():
+            combined.add_edge(u, v, **data)
+    return combined
+
+
+def _combine(automata: Sequence[_Automaton]) -> _Automaton:
+    """
+    Combines several automata into one. The initial state of the result
+    has the initial transitions of all automata, all other states are copied
+    with their state numbers shifted. `owners` tells which automaton each
+    state came from.
+
+    The combined initial state never accepts: the empty match isn't
+    meaningful when searching for several expressions at once.
+    """
+
+    initial_transitions = []
+    transitions = []
+    accepting = []
+    owners = []
+
+    for owner, automaton in enumerate(automata):
+        # State `i` of this automaton becomes state `i + offset`, the initial
+        # state (0) is merged into the new initial state.
+        offset = len(transitions)
+
+        def _shift(transition: _Transition) -> _Transition:
+            return _Transition(
+                target=transition.target + offset,
+                matcher=transition.matcher,
+                data=transition.data,
+            )
+
+        initial_transitions.extend(map(_shift, automaton.transitions[0]))
+        for state in range(1, len(automaton.transitions)):
+            transitions.append(
+                tuple(map(_shift, automaton.transitions[state]))
+            )
+            accepting.append(automaton.accepting[state])
+            owners.append(owner)
+
+    return _Automaton(
+        transitions=(tuple(initial_transitions), *transitions),
+        accepting=(False, *accepting),
+        owners=(-1, *owners),
+    )
+
+
+def _item_key(item: Any) -> Hashable:
+    """
+    Key to compare matched items when de-duplicating explorers. Unhashable
+    items (like events) are compared by identity.
+    """
+
+    if type(item).__hash__ is None:
+        return False, id(item)
+    return True, item
+
+
+class _Trail(Generic[Out]):
+    """
+    Persistent trail of an explorer. Every trail points to the trail it
+    extends, so advancing an explorer is O(1) and explorers that share a
+    past share the same items.
+
+    Iterating gives the `_TrailItem`s from first to last.
+    """
+
+    __slots__ = ("parent", "item", "length")
+
+    def __init__(
+        self,
+        parent: Optional["_Trail[Out]"] = None,
+        item: Optional[_TrailItem[Out]] = None,
+    ):
+        self.parent = parent
+        self.item = item
+        self.length = parent.length + 1 if parent is not None else 0
+
+    def append(self, item: _TrailItem[Out]) -> "_Trail[Out]":
+        return _Trail(self, item)
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __iter__(self) -> Iterator[_TrailItem[Out]]:
+        return iter(self.as_tuple())
+
+    def as_tuple(self) -> Tuple[_TrailItem[Out], ...]:
+        items = []
+        ptr = self
+        while ptr.parent is not None:
+            items.append(ptr.item)
+            ptr = ptr.parent
+        items.reverse()
+        return tuple(items)
+
+    def __eq__(self, other):
+        if not isinstance(other, _Trail):
+            return NotImplemented
+        return self.as_tuple() == other.as_tuple()
+
+    def __lt__(self, other):
+        """
+        Sortability for de-duplication purposes
+        """
+
+        return self.as_tuple() < other.as_tuple()
+
+
+_EMPTY_TRAIL = _Trail()
+
+
+@dataclass(frozen=True)
+class _OpenCapture:
+    """
+    A capture group that is open at some point of the matching process.
+    `first` is the first item of the group and `start` its index in the
+    trail.
+    """
+
+    name: Text
+    start: int
+    first: Any
+
+
+@dataclass(frozen=True)
+class _CaptureState:
+    """
+    Capture bookkeeping of an explorer, derived from its trail.
+
+    - `open` is the stack of currently open capture groups
+    - `first_items` holds the first item of every capture
+    - `parents` holds the names of the groups that were open when a capture
+      started
+
+    This mirrors what `_make_match()` builds: a capture that starts again
+    replaces the previous one with the same name, including everything that
+    was captured inside of it. The state only changes at capture boundaries,
+    for all other tokens explorers keep sharing the same state.
+    """
+
+    open: Tuple[_OpenCapture, ...] = ()
+    first_items: Mapping[Text, Any] = field(
+        default_factory=lambda: MappingProxyType({})
+    )
+    parents: Mapping[Text, Tuple[Text, ...]] = field(
+        default_factory=lambda: MappingProxyType({})
+    )
+
+    def advance(
+        self, data: Dict[Text, Sequence[Capture]], item: Any, pos: int
+    ) -> "_CaptureState":
+        """
+        State after consuming a token at index `pos` of the trail via an
+        edge with `data`, where the matcher output `item`.
+        """
+
+        stop_captures = data.get("stop_captures")
+        start_captures = data.get("start_captures")
+        if not stop_captures and not start_captures:
+            return self
+
+        open_ = self.open
+        for capture in stop_captures or ():
+            if not open_ or open_[-1].name != capture.name:
+                raise ValueError("Trying to stop a match which is not started")
+            open_ = open_[:-1]
+
+        if not start_captures:
+            return _CaptureState(
+                open=open_, first_items=self.first_items, parents=self.parents
+            )
+
+        first_items = dict(self.first_items)
+        parents = dict(self.parents)
+        path = tuple(capture.name for capture in open_)
+        for capture in start_captures:
+            # Forget what was captured inside of the previous capture
+            prefix = path + (capture.name,)
+            for name, parent in list(parents.items()):
+                if parent[: len(prefix)] == prefix:
+                    del first_items[name]
+                    del parents[name]
+
+            first_items[capture.name] = item
+            parents[capture.name] = path
+            open_ += (_OpenCapture(capture.name, pos, item),)
+            path = prefix
+
+        return _CaptureState(
+            open=open_,
+            first_items=MappingProxyType(first_items),
+            parents=MappingProxyType(parents),
+        )
+
+
+_NO_CAPTURES = _CaptureState()
+
+
+class _PendingTrail(Sequence[_TrailItem[Out]]):
+    """
+    Trail that is passed to a matcher: the trail of the explorer followed by
+    a placeholder item (None) for the token being matched.
+
+    The items are only built when the trail is actually used as a sequence.
+    Matchers that just need the captures can use `captures` and
+    `open_captures` instead, which don't depend on the length of the trail.
+    """
+
+    __slots__ = ("_trail", "_data", "_captures", "_state", "_items")
+
+    def __init__(
+        self,
+        trail: _Trail[Out],
+        data: Dict[Text, Sequence[Capture]],
+        captures: _CaptureState,
+    ):
+        self._trail = trail
+        self._data = data
+        self._captures = captures
+        self._state = None
+        self._items = None
+
+    @property
+    def pos(self) -> int:
+        """
+        Index of the token being matched in the trail
+        """
+
+        return self._trail.length
+
+    @property
+    def _capture_state(self) -> _CaptureState:
+        if self._state is None:
+            self._state = self._captures.advance(self._data, None, self.pos)
+        return self._state
+
+    @property
+    def captures(self) -> Mapping[Text, Any]:
+        """
+        First item of every visible capture. Captures that start at the
+        token being matched have None as first item.
+        """
+
+        return self._capture_state.first_items
+
+    @property
+    def open_captures(self) -> Tuple[_OpenCapture, ...]:
+        """
+        Capture groups the token being matched is part of
+        """
+
+        return self._capture_state.open
+
+    def _as_tuple(self) -> Tuple[_TrailItem[Out], ...]:
+        if self._items is None:
+            self._items = self._trail.as_tuple() + (
+                _TrailItem(item=None, data=self._data),
+            )
+        return self._items
+
+    def __len__(self) -> int:
+        return self._trail.length + 1
+
+    def __getitem__(self, item):
+        return self._as_tuple()[item]
+
+    def __iter__(self) -> Iterator[_TrailItem[Out]]:
+        return iter(self._as_tuple())
+
+    def __add__(self, other):
+        return self._as_tuple() + other
+
+
 @dataclass(frozen=True)
 class Explorer(Generic[Tok, Out]):
     """
-    An explorer is a pointer to a specific position in the graph, with a past
-    trail of previously visited nodes.
+    An explorer is a pointer to a specific state of the compiled automaton,
+    with a past trail of previously visited nodes.
+
+    `trail_key` identifies the trail: within one step of the matching
+    process, two explorers have the same `trail_key` if and only if they
+    have the same trail. `captures` is derived from the trail, and updated
+    along with it.
     """
 
     re: "RegExp[Tok, Out]"
-    node: Node[Tok, Out]
-    trail: Tuple[_TrailItem[Out], ...]
+    state: int
+    trail: _Trail[Out] = field(default_factory=lambda: _EMPTY_TRAIL)
+    trail_key: int = 0
+    captures: _CaptureState = _NO_CAPTURES
 
     @property
-    def signature(self) -> Tuple[Node, Tuple[_TrailItem, ...]]:
+    def signature(self) -> Tuple[int, int]:
         """
-        Sortable signature for this explorer, used for de-duplication
+        Hashable signature for this explorer, used for de-duplication
         """
 
-        return self.node, self.trail
+        return self.state, self.trail_key
 
-    def advance(self, token: Tok) -> Iterator["Explorer[Tok, Out]"]:
+    def advance(
+        self, token: Tok, trail_keys: Dict[Tuple, int]
+    ) -> Iterator["Explorer[Tok, Out]"]:
         """
         Given the provided token, emits all the explorers that managed to
-        advance to another node.
+        advance to another state.
 
         Parameters
         ----------
         token
             Consumed token
+        trail_keys
+            Trail keys assigned in the current step. Shared by all explorers
+            that advance on the same token.
         """
 
-        for s in self.re.graph.successors(self.node):
-            if not isinstance(s, Final):
-                continue
+        for transition in self.re.automaton.transitions[self.state]:
+            data = transition.data
+            possible_trail = _PendingTrail(self.trail, data, self.captures)
 
-            data = self.re.graph.get_edge_data(self.node, s, default={})
-            possible_trail = self.trail + (_TrailItem(item=None, data=data),)
+            for m in transition.matcher.match(token, trail=possible_trail):
+                key = (self.trail_key, id(data), _item_key(m))
+                trail_key = trail_keys.get(key)
+                if trail_key is None:
+                    trail_key = trail_keys[key] = len(trail_keys)
 
-            for m in s.statement.match(token, trail=possible_trail):
                 yield Explorer(
                     re=self.re,
-                    node=s,
-                    trail=self.trail + (_TrailItem(item=m, data=data),),
+                    state=transition.target,
+                    trail=self.trail.append(_TrailItem(item=m, data=data)),
+                    trail_key=trail_key,
+                    captures=self.captures.advance(data, m, self.trail.length),
                 )
 
     def can_terminate(self) -> bool:
@@ -344,7 +824,7 @@ class Explorer(Generic[Tok, Out]):
         that if you were to stop the matching here it would mean that the
         expression matched.
         """
-        return self.re.graph.has_successor(self.node, _Terminal())
+        return self.re.automaton.accepting[self.state]
 
 
 class _Match(Generic[Out]):
@@ -467,7 +947,8 @@ class Match(Generic[Out]):
     Represents a match for a capture group in the regular expression.
     """
 
-    # Index of the first matching token
+    # Index of the first matching token in the input sequence. For captures
+    # this is an index in the same sequence, not within the parent match.
     start_pos: int
 
     # Sub-groups that matched. As several groups could be matching, a list
@@ -495,7 +976,9 @@ class MatchList(tuple, Generic[Out]):
             return super().__getitem__(item)
 
 
-def _make_match(trail: Tuple[_TrailItem, ...]) -> _Match[Out]:
+def _make_match(
+    trail: Iterable[_TrailItem], start_pos: int = 0
+) -> _Match[Out]:
     """
     Transforms an explorer into a Match object using its trail
 
@@ -503,22 +986,41 @@ def _make_match(trail: Tuple[_TrailItem, ...]) -> _Match[Out]:
     ----------
     explorer
         Explorer that you want to transform
+    start_pos
+        Index of the first token of the trail in the input sequence. The
+        positions of the captures are offset by it as well.
     """
 
-    match = _Match(0)
+    match = _Match(start_pos)
 
     for i, token in enumerate(trail):
         for stop in token.data.get("stop_captures", []):
             match.stop(stop)
 
         for start in token.data.get("start_captures", []):
-            match.start(start, i)
+            match.start(start, start_pos + i)
 
         match.append(token.item)
 
     return match
 
 
+@dataclass
+class _Run(Generic[Tok, Out]):
+    """
+    All explorers that started at the same position of the input sequence.
+    Used by `RegExp#search()` to advance matches for different start
+    positions together.
+    """
+
+    start_pos: int
+    stack: List[Explorer[Tok, Out]]
+
+    # Per owner, the explorers of the last stack that could terminate. This
+    # is the longest match found so far for this start position.
+    terminal: Dict[int, List[Explorer[Tok, Out]]] = field(default_factory=dict)
+
+
 class RegExp(Generic[Tok, Out]):
     """
     Core of the RegExp system. Don't instantiate this directly. There is so
@@ -535,7 +1037,7 @@ class RegExp(Generic[Tok, Out]):
     >>> assert m['domain'].trail == 'with-madrid.com'
     """
 
-    def __init__(self, graph: nx.DiGraph):
+    def __init__(self, automaton: _Automaton, graph: _DiGraph = None):
         """
         Don't call me directly.
 
@@ -545,11 +1047,26 @@ class RegExp(Generic[Tok, Out]):
 
         Parameters
         ----------
+        automaton
+            The regular expression's compiled transition tables
         graph
-            The regular expression's graph
+            The graph the automaton was compiled from
+        """
+
+        self.automaton = automaton
+        self._graph = graph
+
+    @property
+    def graph(self) -> "nx.DiGraph":
+        """
+        The regular expression's graph as a `networkx.DiGraph`. Only meant for
+        debugging and visualisation, requires networkx to be installed.
         """
 
-        self.graph = graph
+        if self._graph is None:
+            raise ValueError("This regular expression has no graph")
+
+        return self._graph.to_networkx()
 
     @classmethod
     def from_ast(cls, root: Node[Tok, Out]) -> "RegExp[Tok, Out]":
@@ -557,13 +1074,46 @@ class RegExp(Generic[Tok, Out]):
         Use this to generate your regular expression. To generate the AST,
         have a look at :py:mod:`nsre.ast` and :py:mod:`nsre.shortcuts` modules.
 
+        The compiled automaton is cached by the identity of `root`, so
+        compiling the same pattern again is free.
+
         Parameters
         ----------
         root
             Root node of your expression.
         """
 
-        return cls(graph=ast_to_graph(root.copy()))
+        try:
+            automaton, graph = _COMPILED_CACHE[root]
+        except KeyError:
+            graph = _build_graph(root.copy(), _DiGraph())
+            automaton = _compile(graph)
+            _COMPILED_CACHE[root] = automaton, graph
+
+        return cls(automaton=automaton, graph=graph)
+
+    @classmethod
+    def combine(cls, regexps: Sequence["RegExp"]) -> "RegExp":
+        """
+        Combines several regular expressions into one automaton, so they can
+        be searched for in a single pass with `search_each()`.
+
+        Parameters
+        ----------
+        regexps
+            The regular expressions to combine. Matches are reported with
+            the index of the expression in this sequence.
+        """
+
+        graphs = [re._graph for re in regexps]
+        return cls(
+            automaton=_combine([re.automaton for re in regexps]),
+            graph=(
+                _combine_graphs(graphs)
+                if all(graph is not None for graph in graphs)
+                else None
+            ),
+        )
 
     def match(
         self,
@@ -599,15 +1149,11 @@ class RegExp(Generic[Tok, Out]):
             them being character lists.
         """
 
-        stack: List[Explorer[Tok, Out]] = [Explorer(self, _Initial(), tuple())]
+        stack: List[Explorer[Tok, Out]] = [Explorer(self, 0)]
 
         stacks = []
         for token in seq:
-            stack = list(
-                self._de_duplicate(
-                    ne for oe in stack for ne in oe.advance(token)
-                )
-            )
+            stack = self._advance(stack, token)
 
             # if not consume_all:
             #     if any(s.can_terminate() for s in stack):
@@ -636,16 +1182,217 @@ class RegExp(Generic[Tok, Out]):
             for s in terminal
         )
 
-    def _de_duplicate(
-        self, stack: Iterator[Explorer[Tok, Out]], key: Text = "signature"
-    ) -> Iterator[Explorer[Tok, Out]]:
+    @property
+    def first_matchers(self) -> Tuple[Matcher, ...]:
+        """
+        Matchers that can consume the first token of a match. A match can
+        only start at a token that is accepted by one of them.
+        """
+
+        return tuple(
+            transition.matcher for transition in self.automaton.transitions[0]
+        )
+
+    def search(
+        self,
+        seq: Sequence[Tok],
+        join_trails: bool = False,
+        starts: Optional[Iterable[int]] = None,
+        window: Optional[Callable[[int, int], bool]] = None,
+        mode: Text = "all",
+    ) -> Iterator[Match[Out]]:
+        """
+        Finds, for every position in the sequence, the longest match starting
+        at that position. This gives the same result as calling
+        `match(seq[i:], consume_all=False)` for every `i`, but all start
+        positions are advanced together in a single pass over the sequence.
+
+        Matches are emitted in order of their start position. The
+        `start_pos` of a match, and of its captures, is the index of its
+        first token in `seq`.
+
+        Parameters
+        ----------
+        seq
+            Sequence in which to search
+        join_trails
+            See `match()`
+        starts
+            Only try to start a match at these positions. Defaults to all
+            positions. Stretches of the sequence in which no match is in
+            progress are skipped.
+        window
+            Optional limit on the extent of a match. Called with the start
+            position of a match and the position of the next token; when it
+            returns False the match is not extended any further. Once a
+            position is outside of the window, all later positions must be
+            outside of it as well.
+        mode
+            "all" (default) reports a match for every start position, even
+            when it overlaps with an earlier match. "non_overlapping" reports
+            the leftmost-longest matches only: after a match, scanning
+            resumes after its last token.
+        """
+
+        for _, match in self.search_each(
+            seq, join_trails, starts, window, mode
+        ):
+            yield match
+
+    def search_each(
+        self,
+        seq: Sequence[Tok],
+        join_trails: bool = False,
+        starts: Optional[Iterable[int]] = None,
+        window: Optional[Callable[[int, int], bool]] = None,
+        mode: Text = "all",
+    ) -> Iterator[Tuple[int, Match[Out]]]:
+        """
+        Like `search()`, but for regular expressions created with
+        `combine()`: for every position, the longest match of each of the
+        combined expressions is emitted together with the index of that
+        expression.
+
+        Matches are emitted in order of their start position, and in order
+        of the expression index for the same start position. In
+        "non_overlapping" mode only the longest match at a start position
+        is emitted (of the lowest expression index when several are equally
+        long), and scanning resumes after it, so no two matches overlap.
+        """
+
+        if mode not in ("all", "non_overlapping"):
+            raise ValueError(f"Unknown search mode: {mode}")
+
+        if starts is None:
+            start_positions = iter(range(len(seq)))
+        else:
+            start_positions = iter(sorted(set(starts)))
+        next_start = next(start_positions, None)
+
+        owners = self.automaton.owners
+
+        # Runs in order of start position. Finished runs stay here until all
+        # runs that started before them are finished as well.
+        pending: "deque[_Run[Tok, Out]]" = deque()
+        active: List[_Run[Tok, Out]] = []
+
+        pos = 0
+        while pos < len(seq):
+            if not active:
+                if next_start is None or next_start >= len(seq):
+                    break
+                pos = max(pos, next_start)
+
+            token = seq[pos]
+
+            if pos == next_start:
+                run = _Run(start_pos=pos, stack=[Explorer(self, 0)])
+                pending.append(run)
+                active.append(run)
+                next_start = next(start_positions, None)
+
+            still_active = []
+            for run in active:
+                if window is not None and not window(run.start_pos, pos):
+                    run.stack = []
+                    continue
+
+                run.stack = self._advance(run.stack, token)
+                if run.stack:
+                    terminal = {}
+                    for explorer in run.stack:
+                        if explorer.can_terminate():
+                            terminal.setdefault(
+                                owners[explorer.state], []
+                            ).append(explorer)
+                    run.terminal.update(terminal)
+                    still_active.append(run)
+            active = still_active
+
+            while pending and not pending[0].stack:
+                run = pending.popleft()
+                for owner, match in self._run_to_matches(
+                    run, join_trails, longest_only=mode == "non_overlapping"
+                ):
+                    yield owner, match
+                    if mode == "non_overlapping":
+                        end = run.start_pos + len(match.trail)
+
+                        # Drop all runs that start inside of the match
+                        while pending and pending[0].start_pos < end:
+                            pending.popleft()
+                        active = [r for r in active if r.start_pos >= end]
+                        while next_start is not None and next_start < end:
+                            next_start = next(start_positions, None)
+
+            pos += 1
+
+        # Runs that are still pending reached the end of the sequence
+        while pending:
+            run = pending.popleft()
+            for owner, match in self._run_to_matches(
+                run, join_trails, longest_only=mode == "non_overlapping"
+            ):
+                yield owner, match
+                if mode == "non_overlapping":
+                    end = run.start_pos + len(match.trail)
+                    while pending and pending[0].start_pos < end:
+                        pending.popleft()
+
+    def _run_to_matches(
+        self, run: _Run[Tok, Out], join_trails: bool, longest_only: bool
+    ) -> Iterator[Tuple[int, Match[Out]]]:
+        """
+        Emits the (first) longest match of a finished run for every owner
+        that matched, or only the longest of those with `longest_only`
+        """
+
+        explorers = [
+            (owner, next(self._de_duplicate(terminal, key="trail")))
+            for owner, terminal in sorted(run.terminal.items())
+        ]
+        if longest_only and explorers:
+            explorers = [max(explorers, key=lambda item: len(item[1].trail))]
+
+        for owner, explorer in explorers:
+            yield owner, _make_match(explorer.trail, run.start_pos).as_match(
+                join_trails=join_trails
+            )
+
+    def _advance(
+        self, stack: List[Explorer[Tok, Out]], token: Tok
+    ) -> List[Explorer[Tok, Out]]:
         """
+        Advances all explorers of the stack with the given token.
+
         As there is potentially several paths that lead to the same result, we
-        merge for each node all identical trails. Without this the number of
+        merge for each state all identical trails. Without this the number of
         results becomes completely crazy (on top of being useless and
         confusing)
         """
 
+        trail_keys: Dict[Tuple, int] = {}
+        signatures = set()
+        new_stack = []
+
+        for explorer in stack:
+            for new_explorer in explorer.advance(token, trail_keys):
+                signature = new_explorer.signature
+                if signature not in signatures:
+                    signatures.add(signature)
+                    new_stack.append(new_explorer)
+
+        return new_stack
+
+    def _de_duplicate(
+        self, stack: Iterator[Explorer[Tok, Out]], key: Text = "trail"
+    ) -> Iterator[Explorer[Tok, Out]]:
+        """
+        Sort-based de-duplication of explorers. Only used to pick a single
+        match out of the terminal explorers, `_advance()` takes care of the
+        de-duplication while matching.
+        """
+
         stack = list(sorted(stack, key=lambda e: getattr(e, key)))
 
         if not stack:
@@ -658,4 +1405,9 @@ class RegExp(Generic[Tok, Out]):
                 yield stack[i]
 
 
+_COMPILED_CACHE: "WeakKeyDictionary[Node, Tuple[_Automaton, _DiGraph]]" = (
+    WeakKeyDictionary()
+)
+
+
 __all__ = ["RegExp", "Match", "MatchList", "ast_to_graph", "_make_match"]
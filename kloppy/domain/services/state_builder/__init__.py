@@ -1,19 +1,35 @@
 from dataclasses import replace
+from typing import Any
 
 from kloppy.domain import List, EventDataset
 
 # register all of them
 from . import builders as _builders
 
+from .builders.sequence import SequenceIndex, SequenceSpan
+from .checkpoints import StateCheckpoints
 from .registered import create_state_builder
+from .session import StateBuilderSession
+from .state import EventState, StateStore
 
 
-def add_state(dataset: EventDataset, *builder_keys: List[str]) -> EventDataset:
+def add_state(
+    dataset: EventDataset, *builder_keys: List[str], copy_events: bool = False
+) -> EventDataset:
     """
     Add state
 
+    The state of all events is kept in run-length encoded columns, and the
+    `state` of every event is a lightweight view on those columns. Keys that
+    were already in the state of an event remain available. Use a
+    `StateBuilderSession` to add state to events that are appended later.
+
     Arguments:
         - builder_keys: `lineup` `score` `sequence`
+        - copy_events: when False (default) the state is set on the events
+            of `dataset` itself, so it also changes for every dataset that
+            shares those events. When True the events are (shallow) copied
+            and the events of `dataset` are left untouched.
 
     Examples:
         >>> dataset = dataset.add_state('lineup', 'score')
@@ -24,29 +40,56 @@ def add_state(dataset: EventDataset, *builder_keys: List[str]) -> EventDataset:
     if len(builder_keys) == 1 and isinstance(builder_keys[0], list):
         builder_keys = builder_keys[0]
 
-    builders = {
-        builder_key: create_state_builder(builder_key)
-        for builder_key in builder_keys
-    }
+    session = StateBuilderSession(
+        dataset, builder_keys, copy_events=copy_events
+    )
+    events = session.process(dataset.events)
 
-    state = {
-        builder_key: builder.initial_state(dataset)
-        for builder_key, builder in builders.items()
-    }
+    dataset = replace(dataset, records=events)
+    if "sequence" in session.store.columns:
+        # The runs of the sequence state are the spans of the sequences
+        column = session.store.columns["sequence"]
+        dataset._sequence_index = SequenceIndex.from_runs(
+            column.starts, column.values, events
+        )
+    return dataset
 
-    events = []
-    for event in dataset.events:
 
-        state = {
-            builder_key: builder.reduce_before(state[builder_key], event)
-            for builder_key, builder in builders.items()
-        }
+def state_at(
+    dataset: EventDataset,
+    event_index: int,
+    builder_key: str,
+    checkpoint_interval: int = 100,
+) -> Any:
+    """
+    State of a single event, without adding state to all events
 
-        events.append(replace(event, state=state))
+    The first call for a builder scans the dataset once and keeps a
+    checkpoint of the state every `checkpoint_interval` events. After that,
+    the state of any event is computed from the nearest checkpoint. Events
+    that are appended to the dataset later are scanned on the next call.
 
-        state = {
-            builder_key: builder.reduce_after(state[builder_key], event)
-            for builder_key, builder in builders.items()
-        }
+    Arguments:
+        - event_index: index of the event in `dataset.events`
+        - builder_key: `lineup` `score` `sequence`
+        - checkpoint_interval: number of events between checkpoints
 
-    return replace(dataset, records=events)
+    Examples:
+        >>> score = dataset.state_at(1000, 'score')
+
+    Returns:
+        The state of the builder, like `event.state[builder_key]` after
+        `add_state`
+    """
+    key = (builder_key, checkpoint_interval)
+    checkpoints = dataset._state_checkpoints.get(key)
+    if checkpoints is not None and checkpoints.is_valid_for(dataset.events):
+        # Events may have been appended since the checkpoints were taken
+        checkpoints.update()
+    else:
+        checkpoints = dataset._state_checkpoints[key] = StateCheckpoints(
+            dataset,
+            create_state_builder(builder_key),
+            interval=checkpoint_interval,
+        )
+    return checkpoints.state_at(event_index)
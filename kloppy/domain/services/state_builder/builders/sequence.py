@@ -1,4 +1,5 @@
 from dataclasses import replace, dataclass
+from typing import Dict, List, Optional
 
 from kloppy.domain import (
     Event,
@@ -11,6 +12,7 @@ from kloppy.domain import (
     FoulCommittedEvent,
     ShotEvent,
     SetPieceQualifier,
+    EventType,
 )
 from ..builder import StateBuilder
 
@@ -50,3 +52,101 @@ class SequenceStateBuilder(StateBuilder):
             )
 
         return state
+
+
+@dataclass(frozen=True)
+class SequenceSpan:
+    """
+    Position of a sequence within the events of a dataset
+
+    Attributes:
+        sequence_id:
+        team: team in possession, None between sequences
+        start: index of the first event of the sequence
+        end: index after the last event of the sequence
+        start_timestamp: timestamp of the first event
+        end_timestamp: timestamp of the last event
+        end_event_type: type of the last event of the sequence
+    """
+
+    sequence_id: int
+    team: Optional[Team]
+    start: int
+    end: int
+    start_timestamp: float
+    end_timestamp: float
+    end_event_type: EventType
+
+
+class SequenceIndex:
+    """
+    Spans of all sequences of a dataset, by sequence id and by team.
+    """
+
+    def __init__(self, spans: List[SequenceSpan], records: List[Event] = None):
+        self.spans = spans
+        # The events the index was built for, to detect changes
+        self.records = records
+        self._length = len(records) if records is not None else None
+        self._by_id: Dict[int, SequenceSpan] = {}
+        self._by_team: Dict[Optional[Team], List[SequenceSpan]] = {}
+        for span in spans:
+            self._by_id[span.sequence_id] = span
+            self._by_team.setdefault(span.team, []).append(span)
+
+    @classmethod
+    def from_runs(
+        cls,
+        starts: List[int],
+        values: List[Sequence],
+        events: List[Event],
+    ) -> "SequenceIndex":
+        """
+        Create the index from the runs of the sequence state: `starts[i]`
+        is the index of the first event with state `values[i]`.
+        """
+        spans = []
+        for i, (start, sequence) in enumerate(zip(starts, values)):
+            end = starts[i + 1] if i + 1 < len(starts) else len(events)
+            spans.append(
+                SequenceSpan(
+                    sequence_id=sequence.sequence_id,
+                    team=sequence.team,
+                    start=start,
+                    end=end,
+                    start_timestamp=events[start].timestamp,
+                    end_timestamp=events[end - 1].timestamp,
+                    end_event_type=events[end - 1].event_type,
+                )
+            )
+        return cls(spans, records=events)
+
+    @classmethod
+    def from_events(cls, events: List[Event]) -> "SequenceIndex":
+        """
+        Create the index from the sequence state of the events
+        """
+        starts = []
+        values = []
+        for index, event in enumerate(events):
+            sequence = event.state["sequence"]
+            if not values or sequence != values[-1]:
+                starts.append(index)
+                values.append(sequence)
+        return cls.from_runs(starts, values, events)
+
+    def is_valid_for(self, records: List[Event]) -> bool:
+        """
+        Returns if the index was built for `records` and they didn't change
+        length since.
+        """
+        return records is self.records and len(records) == self._length
+
+    def __getitem__(self, sequence_id: int) -> SequenceSpan:
+        return self._by_id[sequence_id]
+
+    def __len__(self) -> int:
+        return len(self.spans)
+
+    def get_team_spans(self, team: Optional[Team]) -> List[SequenceSpan]:
+        return self._by_team.get(team, [])
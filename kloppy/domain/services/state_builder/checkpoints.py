@@ -0,0 +1,75 @@
+from typing import Any, List
+
+from kloppy.domain import Event, EventDataset
+
+from .builder import StateBuilder
+
+
+class StateCheckpoints:
+    """
+    State of a single builder at every `interval`-th event of a dataset.
+
+    The checkpoints are taken during one scan over the events. The state at
+    any event is then found by replaying the builder from the nearest
+    checkpoint before it, which takes at most `interval` steps.
+    """
+
+    def __init__(
+        self, dataset: EventDataset, builder: StateBuilder, interval: int
+    ):
+        if interval < 1:
+            raise ValueError("interval must be at least 1")
+
+        self.events = dataset.events
+        self.builder = builder
+        self.interval = interval
+
+        # checkpoints[i] is the state before event `i * interval`
+        self.checkpoints: List[Any] = []
+
+        # State after the last scanned event
+        self._state = builder.initial_state(dataset)
+        self._length = 0
+        self.update()
+
+    def is_valid_for(self, events: List[Event]) -> bool:
+        """
+        Returns if the checkpoints were taken for `events`. Events that were
+        appended since can be added with `update`.
+        """
+        return events is self.events and len(events) >= self._length
+
+    def update(self):
+        """
+        Take the checkpoints of events that were appended since the last
+        scan
+        """
+        builder = self.builder
+        state = self._state
+        for index in range(self._length, len(self.events)):
+            event = self.events[index]
+            if index % self.interval == 0:
+                self.checkpoints.append(state)
+            state = builder.reduce_after(
+                builder.reduce_before(state, event), event
+            )
+        self._state = state
+        self._length = len(self.events)
+
+    def state_at(self, event_index: int) -> Any:
+        """
+        Returns the state of event `event_index`, as `add_state` would set
+        it.
+        """
+        if event_index < 0:
+            event_index += len(self.events)
+        if not 0 <= event_index < len(self.events):
+            raise IndexError("event index out of range")
+
+        checkpoint = event_index // self.interval
+        state = self.checkpoints[checkpoint]
+        for event in self.events[checkpoint * self.interval : event_index]:
+            state = self.builder.reduce_after(
+                self.builder.reduce_before(state, event), event
+            )
+        return self.builder.reduce_before(state, self.events[event_index])
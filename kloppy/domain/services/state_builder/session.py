@@ -0,0 +1,104 @@
+from typing import Any, Iterable, List, Mapping, Optional
+
+from kloppy.domain import Event, EventDataset
+
+from .registered import create_state_builder
+from .state import EventState, StateStore
+
+
+def _shallow_copy(event: Event) -> Event:
+    """
+    Copy of the event that shares all attributes, without running
+    `__init__` and `__post_init__` again.
+    """
+    event_copy = object.__new__(type(event))
+    event_copy.__dict__.update(event.__dict__)
+    return event_copy
+
+
+class StateBuilderSession:
+    """
+    Resumable state building. The session keeps the last state of every
+    builder, so events that are appended to a dataset (for example during a
+    live match) can be processed without going over the earlier events
+    again.
+
+    The initial state of the builders is taken from `dataset`. It can be
+    empty when no events are known yet, but note that the sequence builder
+    uses the first events of the dataset to determine the initial team.
+
+    Examples:
+        >>> session = StateBuilderSession(dataset, ['score', 'lineup'])
+        >>> session.process(dataset.events)
+        >>> # later, when new events arrive
+        >>> new_events = session.process(new_events)
+        >>> dataset.records.extend(new_events)
+    """
+
+    def __init__(
+        self,
+        dataset: EventDataset,
+        builder_keys: List[str],
+        copy_events: bool = False,
+    ):
+        self.builders = {
+            builder_key: create_state_builder(builder_key)
+            for builder_key in builder_keys
+        }
+        self.copy_events = copy_events
+        self.store = StateStore(self.builders.keys())
+
+        self._columns = [
+            (builder, self.store.columns[builder_key])
+            for builder_key, builder in self.builders.items()
+        ]
+        # State after the last processed event
+        self._state = [
+            builder.initial_state(dataset) for builder, _ in self._columns
+        ]
+        self._index = 0
+
+    def process(self, events: Iterable[Event]) -> List[Event]:
+        """
+        Add state to events that follow the events processed so far.
+
+        Returns:
+            The events with state. These are the given events, or shallow
+            copies of them when the session was created with
+            `copy_events=True`.
+        """
+        result = []
+        for event in events:
+            for i, (builder, column) in enumerate(self._columns):
+                value = builder.reduce_before(self._state[i], event)
+                column.append(self._index, value)
+                self._state[i] = builder.reduce_after(value, event)
+
+            event_state = EventState(
+                self.store, self._index, parent=self._parent_state(event.state)
+            )
+            if self.copy_events:
+                event = _shallow_copy(event)
+            event.state = event_state
+            result.append(event)
+
+            self._index += 1
+        return result
+
+    def _parent_state(
+        self, state: Optional[Mapping[str, Any]]
+    ) -> Optional[Mapping[str, Any]]:
+        """
+        The state the event already has, used as parent of the new state.
+        Views that only hold keys of this session are skipped, so adding
+        the same state again doesn't build a chain of views. The state
+        itself is shared, not copied.
+        """
+        if isinstance(state, EventState):
+            parent = self._parent_state(state._parent)
+            if state._store.columns.keys() <= self.store.columns.keys():
+                return parent
+            if parent is not state._parent:
+                return EventState(state._store, state._index, parent=parent)
+            return state
+        return state or None
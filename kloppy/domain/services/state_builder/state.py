@@ -0,0 +1,95 @@
+from bisect import bisect_right
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional
+
+
+class StateColumn:
+    """
+    State of one builder for all events of a dataset, run-length encoded:
+    `starts[i]` is the index of the first event that has `values[i]` as
+    state. A new run only starts when a builder returns another object than
+    for the previous event.
+    """
+
+    __slots__ = ("starts", "values")
+
+    def __init__(self):
+        self.starts: List[int] = []
+        self.values: List[Any] = []
+
+    def append(self, index: int, value: Any):
+        """
+        Set the state of event `index`. Must be called for increasing
+        indices.
+        """
+        if not self.values or value is not self.values[-1]:
+            self.starts.append(index)
+            self.values.append(value)
+
+    def __getitem__(self, index: int) -> Any:
+        return self.values[bisect_right(self.starts, index) - 1]
+
+    def __len__(self):
+        """
+        Number of runs
+        """
+        return len(self.starts)
+
+
+class StateStore:
+    """
+    Columns with the state of every builder, aligned with the events of a
+    dataset.
+    """
+
+    __slots__ = ("columns",)
+
+    def __init__(self, builder_keys: Iterable[str]):
+        self.columns: Dict[str, StateColumn] = {
+            builder_key: StateColumn() for builder_key in builder_keys
+        }
+
+
+class EventState(Mapping):
+    """
+    The `state` of an event: a read-only view on the state of the event in a
+    `StateStore`. Keys that are not in the store are looked up in `parent`,
+    the state the event had before.
+    """
+
+    __slots__ = ("_store", "_index", "_parent")
+
+    def __init__(
+        self,
+        store: StateStore,
+        index: int,
+        parent: Optional[Mapping[str, Any]] = None,
+    ):
+        self._store = store
+        self._index = index
+        self._parent = parent
+
+    def __getitem__(self, key: str) -> Any:
+        column = self._store.columns.get(key)
+        if column is not None:
+            return column[self._index]
+        if self._parent is not None:
+            return self._parent[key]
+        raise KeyError(key)
+
+    def __contains__(self, key) -> bool:
+        return key in self._store.columns or (
+            self._parent is not None and key in self._parent
+        )
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._store.columns
+        if self._parent is not None:
+            for key in self._parent:
+                if key not in self._store.columns:
+                    yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"EventState({dict(self)!r})"
@@ -0,0 +1,145 @@
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+from kloppy.domain import EventDataset, Frame, TrackingDataset
+from kloppy.exceptions import KloppyError
+
+
+class SyncResult:
+    """
+    Frame of every event after synchronizing an event dataset with a
+    tracking dataset.
+
+    Attributes:
+        frame_indices: position in `tracking_dataset.frames` for every event
+            of `event_dataset`, -1 when no frame matched.
+    """
+
+    def __init__(
+        self,
+        event_dataset: EventDataset,
+        tracking_dataset: TrackingDataset,
+        frame_indices: np.ndarray,
+    ):
+        self.event_dataset = event_dataset
+        self.tracking_dataset = tracking_dataset
+        self.frame_indices = frame_indices
+
+    def __len__(self) -> int:
+        return len(self.frame_indices)
+
+    def get_frame(self, event_index: int) -> Optional[Frame]:
+        """
+        Returns the frame of the event at `event_index`, or None
+        """
+        position = self.frame_indices[event_index]
+        if position < 0:
+            return None
+        return self.tracking_dataset.frames[position]
+
+    @property
+    def frames(self) -> List[Optional[Frame]]:
+        """
+        The frame of every event, None for events without a frame
+        """
+        frames = self.tracking_dataset.frames
+        return [
+            frames[position] if position >= 0 else None
+            for position in self.frame_indices.tolist()
+        ]
+
+    @property
+    def matched(self) -> np.ndarray:
+        return self.frame_indices >= 0
+
+
+def _period_offset(
+    offset: Union[float, Dict[int, float]], period_id: int
+) -> float:
+    if isinstance(offset, dict):
+        return offset.get(period_id, 0.0)
+    return offset
+
+
+def sync(
+    event_dataset: EventDataset,
+    tracking_dataset: TrackingDataset,
+    tolerance: Optional[float] = None,
+    offset: Union[float, Dict[int, float]] = 0.0,
+    drift: float = 0.0,
+) -> SyncResult:
+    """
+    Synchronize events with frames
+
+    Every event is matched with the frame closest in time within the same
+    period. The events of a period are matched at once with a binary search
+    over the (sorted) frame timestamps of that period.
+
+    The timestamp of an event is corrected before matching:
+    `timestamp + offset + drift * timestamp`.
+
+    Arguments:
+        - tolerance: maximum difference in seconds between an event and its
+            frame. Events without a frame within `tolerance` don't match.
+        - offset: seconds to add to the event timestamps, or a dict with
+            the offset per period id
+        - drift: seconds the tracking clock runs ahead of the event clock,
+            per second of play
+
+    Examples:
+        >>> result = sync(event_dataset, tracking_dataset, tolerance=0.1)
+        >>> frame = result.get_frame(10)
+
+    Returns:
+        [`SyncResult`][kloppy.domain.services.synchronization.SyncResult]
+    """
+    if tolerance is not None and tolerance < 0:
+        raise KloppyError("tolerance must be positive")
+
+    events = event_dataset.events
+    timestamps = np.fromiter(
+        (event.timestamp for event in events), dtype=float, count=len(events)
+    )
+    period_ids = np.fromiter(
+        (event.period.id for event in events), dtype=int, count=len(events)
+    )
+    frame_indices = np.full(len(events), -1, dtype=np.int64)
+
+    time_index = tracking_dataset.get_time_index()
+    for period_id in np.unique(period_ids).tolist():
+        frame_timestamps = np.asarray(
+            time_index.timestamps.get(period_id, []), dtype=float
+        )
+        if not len(frame_timestamps):
+            continue
+        frame_positions = np.asarray(time_index.positions[period_id])
+
+        mask = period_ids == period_id
+        event_timestamps = timestamps[mask]
+        event_timestamps = (
+            event_timestamps
+            + _period_offset(offset, period_id)
+            + drift * event_timestamps
+        )
+
+        # The closest frame is either the first one at or after the event,
+        # or the one before it.
+        after = np.searchsorted(frame_timestamps, event_timestamps)
+        after = np.minimum(after, len(frame_timestamps) - 1)
+        before = np.maximum(after - 1, 0)
+        use_before = np.abs(
+            event_timestamps - frame_timestamps[before]
+        ) <= np.abs(frame_timestamps[after] - event_timestamps)
+        closest = np.where(use_before, before, after)
+
+        matches = frame_positions[closest]
+        if tolerance is not None:
+            distance = np.abs(frame_timestamps[closest] - event_timestamps)
+            matches = np.where(distance <= tolerance, matches, -1)
+        frame_indices[mask] = matches
+
+    return SyncResult(event_dataset, tracking_dataset, frame_indices)
+
+
+__all__ = ["sync", "SyncResult"]
@@ -1,6 +1,7 @@
 from dataclasses import asdict, fields, replace
+from functools import lru_cache
 from kloppy.domain.models.tracking import PlayerData
-from typing import TypeVar, Union
+from typing import Callable, Dict, Tuple, Type, TypeVar, Union
 
 from kloppy.domain import (
     AttackingDirection,
@@ -22,6 +23,36 @@ from kloppy.domain.models.event import Event
 from kloppy.exceptions import KloppyError
 
 
+@lru_cache(maxsize=None)
+def _get_coordinate_field_names(event_cls: Type[Event]) -> Tuple[str, ...]:
+    """
+    Returns the names of all fields of `event_cls` that hold a Point. The
+    result is cached per event class, so `dataclasses.fields` only has to be
+    inspected once instead of for every event.
+    """
+    return tuple(
+        field.name
+        for field in fields(event_cls)
+        if field.name.endswith("coordinates")
+    )
+
+
+def _replace_event_coordinates(
+    event: Event, transform_point: Callable[[Point], Point]
+) -> Event:
+    """
+    Returns a copy of `event` with `transform_point` applied to all
+    coordinates
+    """
+    position_changes: Dict[str, Point] = {}
+    for name in _get_coordinate_field_names(type(event)):
+        point = getattr(event, name)
+        if point:
+            position_changes[name] = transform_point(point)
+
+    return replace(event, **position_changes)
+
+
 class Transformer:
     def __init__(
         self,
@@ -280,40 +311,17 @@ class Transformer:
 
     def __change_event_coordinate_system(self, event: Event):
 
-        position_changes = {
-            field.name: self.__change_point_coordinate_system(
-                getattr(event, field.name)
-            )
-            for field in fields(event)
-            if field.name.endswith("coordinates")
-            and getattr(event, field.name)
-        }
-
-        return replace(event, **position_changes)
+        return _replace_event_coordinates(
+            event, self.__change_point_coordinate_system
+        )
 
     def __change_event_dimensions(self, event: Event):
 
-        position_changes = {
-            field.name: self.change_point_dimensions(
-                getattr(event, field.name)
-            )
-            for field in fields(event)
-            if field.name.endswith("coordinates")
-            and getattr(event, field.name)
-        }
-
-        return replace(event, **position_changes)
+        return _replace_event_coordinates(event, self.change_point_dimensions)
 
     def __flip_event(self, event: Event):
 
-        position_changes = {
-            field.name: self.flip_point(getattr(event, field.name))
-            for field in fields(event)
-            if field.name.endswith("coordinates")
-            and getattr(event, field.name)
-        }
-
-        return replace(event, **position_changes)
+        return _replace_event_coordinates(event, self.flip_point)
 
     def get_to_coordinate_system(self) -> CoordinateSystem:
         return self._to_coordinate_system
@@ -1 +1,2 @@
 from .domain.services.matchers.pattern.event import *
+from .domain.services.matchers.pattern.index import *
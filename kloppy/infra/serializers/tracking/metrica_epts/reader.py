@@ -1,6 +1,7 @@
 import re
 from typing import List, Tuple, Set, Iterator, IO
 
+from kloppy.domain import PeriodIndex
 from kloppy.utils import Readable
 
 from .models import (
@@ -71,7 +72,7 @@ def read_raw_data(
 
     _set_current_data_spec(0)
 
-    periods = metadata.periods
+    period_index = PeriodIndex(metadata.periods)
     n = 0
     sample = 1.0 / sample_rate
 
@@ -89,11 +90,8 @@ def read_raw_data(
             row["frame_id"] = frame_id
             row["timestamp"] = timestamp
 
-            row["period_id"] = None
-            for period in periods:
-                if period.start_timestamp <= timestamp <= period.end_timestamp:
-                    row["period_id"] = period.id
-                    break
+            period = period_index.find(timestamp)
+            row["period_id"] = period.id if period else None
 
             yield row
 
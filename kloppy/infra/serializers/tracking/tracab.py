@@ -13,6 +13,7 @@ from kloppy.domain import (
     Team,
     BallState,
     Period,
+    PeriodIndex,
     Provider,
     Orientation,
     PitchDimensions,
@@ -166,6 +167,8 @@ class TRACABDeserializer(TrackingDataDeserializer[TRACABInputs]):
                 length=pitch_size_width, width=pitch_size_height
             )
 
+            period_index = PeriodIndex(periods)
+
             def _iter():
                 n = 0
                 sample = 1.0 / self.sample_rate
@@ -179,11 +182,11 @@ class TRACABDeserializer(TrackingDataDeserializer[TRACABInputs]):
                     if self.only_alive and not line_.endswith("Alive;:"):
                         continue
 
-                    for period_ in periods:
-                        if period_.contains(frame_id / frame_rate):
-                            if n % sample == 0:
-                                yield period_, line_
-                            n += 1
+                    period_ = period_index.find(frame_id / frame_rate)
+                    if period_:
+                        if n % sample == 0:
+                            yield period_, line_
+                        n += 1
 
             frames = []
             for n, (period, line) in enumerate(_iter()):
@@ -0,0 +1,394 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from kloppy import statsbomb
+from kloppy import event_pattern_matching as pm
+from kloppy.domain import ShotEvent
+from kloppy.domain.services.matchers.pattern.event import (
+    WithCaptureMatcher,
+    _candidate_starts,
+    _map_finals,
+)
+from kloppy.domain.services.matchers.pattern.regexp import (
+    Anything,
+    Final,
+    Matcher,
+    RegExp,
+    _make_match,
+)
+
+
+class _CheckCapturesMatcher(Matcher):
+    """
+    Checks that the captures kept track of by the engine are the same as
+    the ones built from the full trail.
+    """
+
+    def __init__(self, matcher: Matcher):
+        self.matcher = matcher
+        self.checked = 0
+
+    def match(self, token, trail):
+        expected = {}
+        WithCaptureMatcher(matcher=None)._add_captures(
+            expected, _make_match(tuple(trail))
+        )
+        assert dict(trail.captures) == expected
+        self.checked += 1
+
+        yield from self.matcher.match(token, trail)
+
+
+class TestEventPatternMatching:
+    def _load_dataset(self):
+        base_dir = os.path.dirname(__file__)
+
+        dataset = statsbomb.load(
+            event_data=f"{base_dir}/files/statsbomb_event.json",
+            lineup_data=f"{base_dir}/files/statsbomb_lineup.json",
+            event_types=["pass", "shot", "carry", "take_on"],
+        )
+        return dataset
+
+    def _pattern(self):
+        return (
+            pm.match_pass(capture="first_pass")
+            + pm.match_pass(team=pm.same_as("first_pass.team"))
+            * slice(None, None)
+            + pm.match_shot(team=pm.same_as("first_pass.team"), capture="shot")
+        )
+
+    def test_search(self):
+        dataset = self._load_dataset()
+
+        matches = pm.search(dataset, self._pattern())
+
+        assert len(matches) == 14
+        for match in matches:
+            assert match.events[0] is match.captures["first_pass"]
+            assert match.events[-1] is match.captures["shot"]
+            assert all(
+                event.team == match.events[0].team for event in match.events
+            )
+
+    def test_search_equals_match_per_start_position(self):
+        dataset = self._load_dataset()
+        events = [event for event in dataset.events if event.period.id == 1]
+        re = RegExp.from_ast(self._pattern())
+
+        expected = []
+        for i in range(len(events)):
+            matches = re.match(events[i:], consume_all=False)
+            if matches:
+                expected.append((i, matches[0].trail))
+
+        assert [
+            (match.start_pos, match.trail) for match in re.search(events)
+        ] == expected
+
+    def test_search_capture_positions(self):
+        dataset = self._load_dataset()
+        events = [event for event in dataset.events if event.period.id == 1]
+        re = RegExp.from_ast(self._pattern())
+
+        matches = list(re.search(events))
+        assert matches
+        for match in matches:
+            # Captures use the same positions as the match itself
+            for name in ("first_pass", "shot"):
+                capture = match[name]
+                assert events[capture.start_pos] is capture.trail[0]
+            assert match["first_pass"].start_pos == match.start_pos
+
+    def test_compiled_pattern_is_cached(self):
+        pattern = self._pattern()
+
+        re1 = RegExp.from_ast(pattern)
+        re2 = RegExp.from_ast(pattern)
+        assert re1.automaton is re2.automaton
+        assert RegExp.from_ast(self._pattern()).automaton is not re1.automaton
+
+    def test_search_only_starts_at_candidates(self):
+        dataset = self._load_dataset()
+        events = [event for event in dataset.events if event.period.id == 1]
+        pattern = pm.match_shot(capture="shot") + pm.match_any(
+            team=pm.not_same_as("shot.team")
+        )
+        re = RegExp.from_ast(pattern)
+
+        starts = _candidate_starts(events, re)
+        assert starts == [
+            i for i, event in enumerate(events) if isinstance(event, ShotEvent)
+        ]
+
+        assert [match.trail for match in re.search(events, starts=starts)] == [
+            match.trail for match in re.search(events)
+        ]
+
+        # A first matcher without filter disables the index
+        pattern = pm.match_any() | Final(Anything())
+        assert _candidate_starts(events, RegExp.from_ast(pattern)) is None
+
+    def test_search_many(self):
+        dataset = self._load_dataset()
+        patterns = {
+            "pass_shot": self._pattern(),
+            "shot_any": pm.match_shot(capture="shot")
+            + pm.match_any(team=pm.not_same_as("shot.team")),
+            "carry": pm.match_carry(capture="carry"),
+        }
+
+        results = pm.search_many(dataset, patterns)
+
+        assert list(results) == list(patterns)
+        for name, pattern in patterns.items():
+            expected = pm.search(dataset, pattern)
+            assert len(results[name]) == len(expected)
+            for match, expected_match in zip(results[name], expected):
+                assert match.events == expected_match.events
+                assert match.captures == expected_match.captures
+
+    def test_search_many_non_overlapping(self):
+        dataset = self._load_dataset()
+        position = {id(event): i for i, event in enumerate(dataset.events)}
+        patterns = {
+            "pass": pm.match_pass(),
+            "two_passes": pm.match_pass() + pm.match_pass(),
+        }
+
+        def spans(results):
+            return {
+                name: [
+                    (
+                        position[id(match.events[0])],
+                        position[id(match.events[-1])],
+                    )
+                    for match in matches
+                ]
+                for name, matches in results.items()
+            }
+
+        # Both patterns match at the first of two passes
+        results = spans(pm.search_many(dataset, patterns))
+        shared_starts = {start for start, _ in results["pass"]} & {
+            start for start, _ in results["two_passes"]
+        }
+        assert shared_starts
+
+        # Only the longest of those matches is kept
+        results = spans(
+            pm.search_many(dataset, patterns, mode="non_overlapping")
+        )
+        assert results["pass"] and results["two_passes"]
+        all_spans = sorted(results["pass"] + results["two_passes"])
+        assert all(
+            end < next_start
+            for (_, end), (next_start, _) in zip(all_spans, all_spans[1:])
+        )
+        assert (
+            results["two_passes"]
+            == spans(
+                {
+                    "two_passes": pm.search(
+                        dataset, patterns["two_passes"], mode="non_overlapping"
+                    )
+                }
+            )["two_passes"]
+        )
+
+    def test_combined_graph(self):
+        pytest.importorskip("networkx")
+
+        re1 = RegExp.from_ast(self._pattern())
+        re2 = RegExp.from_ast(pm.match_carry(capture="carry"))
+        combined = RegExp.combine([re1, re2])
+
+        graph = combined.graph
+        assert set(graph.nodes) == set(re1.graph.nodes) | set(re2.graph.nodes)
+        assert graph.number_of_edges() == (
+            re1.graph.number_of_edges() + re2.graph.number_of_edges()
+        )
+
+        with pytest.raises(ValueError):
+            RegExp(automaton=combined.automaton).graph
+
+    def test_search_with_window(self):
+        dataset = self._load_dataset()
+        events = [event for event in dataset.events if event.period.id == 1]
+        pattern = self._pattern()
+        re = RegExp.from_ast(pattern)
+
+        for max_duration, max_events in [(None, 2), (5.0, None), (10.0, 4)]:
+            expected = []
+            for i in range(len(events)):
+                window = [
+                    event
+                    for j, event in enumerate(events[i:])
+                    if (max_events is None or j < max_events)
+                    and (
+                        max_duration is None
+                        or event.timestamp - events[i].timestamp
+                        <= max_duration
+                    )
+                ]
+                matches = re.match(window, consume_all=False)
+                if matches:
+                    expected.append(matches[0].trail)
+
+            matches = [
+                match
+                for match in pm.search(
+                    dataset,
+                    pattern,
+                    max_duration=max_duration,
+                    max_events=max_events,
+                )
+                if match.events[0].period.id == 1
+            ]
+            assert [match.events for match in matches] == expected
+
+    def test_group_with_window(self):
+        dataset = self._load_dataset()
+        pattern = pm.match_pass(capture="first_pass") + pm.group(
+            pm.match_pass(team=pm.same_as("first_pass.team"))
+            * slice(None, None)
+            + pm.match_shot(
+                team=pm.same_as("first_pass.team"), capture="shot"
+            ),
+            max_events=2,
+        )
+        equivalent_pattern = (
+            pm.match_pass(capture="first_pass")
+            + pm.match_pass(team=pm.same_as("first_pass.team")) * slice(0, 1)
+            + pm.match_shot(team=pm.same_as("first_pass.team"), capture="shot")
+        )
+
+        matches = pm.search(dataset, pattern)
+        expected = pm.search(dataset, equivalent_pattern)
+
+        assert len(matches) == len(expected) > 0
+        for match, expected_match in zip(matches, expected):
+            assert match.events == expected_match.events
+            assert match.captures == expected_match.captures
+
+    def test_incremental_captures(self):
+        dataset = self._load_dataset()
+        matchers = []
+
+        def _check(matcher):
+            matchers.append(_CheckCapturesMatcher(matcher))
+            return matchers[-1]
+
+        pattern = _map_finals(
+            self._pattern() + pm.match_any(capture="after") * slice(0, 2),
+            _check,
+        )
+
+        matches = pm.search(dataset, pattern)
+
+        assert matches
+        assert sum(matcher.checked for matcher in matchers) > len(matches)
+
+    def test_search_non_overlapping(self):
+        dataset = self._load_dataset()
+        events = [event for event in dataset.events if event.period.id == 1]
+        re = RegExp.from_ast(self._pattern())
+
+        expected = []
+        end = 0
+        for match in re.search(events):
+            if match.start_pos >= end:
+                expected.append(match)
+                end = match.start_pos + len(match.trail)
+
+        matches = list(re.search(events, mode="non_overlapping"))
+        assert matches == expected
+        assert len(matches) < len(list(re.search(events)))
+
+        matches = pm.search(dataset, self._pattern(), mode="non_overlapping")
+        assert len(matches) == 11
+
+    def test_search_parallel(self):
+        dataset = self._load_dataset()
+        other_dataset = dataset.filter(lambda event: event.period.id == 2)
+        pattern = self._pattern()
+
+        expected = pm.search(dataset, pattern)
+        assert pm.search(dataset, pattern, n_workers=2) == expected
+
+        results = pm.search_datasets(
+            [dataset, other_dataset], pattern, n_workers=2
+        )
+        assert results == [expected, pm.search(other_dataset, pattern)]
+        for match, expected_match in zip(results[0], expected):
+            assert all(
+                event is expected_event
+                for event, expected_event in zip(
+                    match.events, expected_match.events
+                )
+            )
+
+    def test_search_parallel_from_threads(self):
+        dataset = self._load_dataset()
+        other_dataset = dataset.filter(lambda event: event.period.id == 2)
+        patterns = [
+            self._pattern(),
+            pm.match_shot(capture="shot")
+            + pm.match_any(team=pm.not_same_as("shot.team")),
+        ]
+        expected = [
+            pm.search_datasets([dataset, other_dataset], pattern)
+            for pattern in patterns
+        ]
+
+        def search(pattern):
+            return pm.search_datasets(
+                [dataset, other_dataset], pattern, n_workers=2
+            )
+
+        # Concurrent searches each get their own units and pattern
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            results = list(executor.map(search, patterns * 2))
+        assert results == expected * 2
+
+    def test_search_index(self, tmp_path):
+        dataset = self._load_dataset()
+        other_dataset = dataset.filter(lambda event: event.period.id == 2)
+        datasets = {"match_1": dataset, "match_2": other_dataset}
+
+        pm.build_index(datasets, n=3).save(tmp_path / "index.json.gz")
+        index = pm.EventIndex.load(tmp_path / "index.json.gz")
+
+        for pattern in [
+            self._pattern(),
+            pm.match_shot(capture="shot")
+            + pm.match_any(team=pm.not_same_as("shot.team")),
+            pm.match_any() + pm.match_shot(),
+        ]:
+            loaded = []
+
+            def load_dataset(match_id):
+                loaded.append(match_id)
+                return datasets[match_id]
+
+            results = pm.search_index(index, pattern, load_dataset)
+            assert len(loaded) == len(set(loaded))
+            for match_id, dataset_ in datasets.items():
+                assert results.get(match_id, []) == pm.search(
+                    dataset_, pattern
+                )
+
+    def test_search_index_candidates(self):
+        dataset = self._load_dataset()
+        index = pm.build_index({"match_1": dataset}, n=3)
+
+        candidates = index.lookup(["PASS/S PASS/S SHOT/S", "PASS/S SHOT/S"])
+        events = [event for event in dataset.events if event.period.id == 1]
+        for pos in candidates["match_1"][1]:
+            assert events[pos].event_type.value == "PASS"
+            assert events[pos + 1].team == events[pos].team
+        assert len(candidates["match_1"][1]) < len(
+            index.lookup(["PASS"])["match_1"][1]
+        )
@@ -1,10 +1,15 @@
 import os
+from dataclasses import replace
 
+import numpy as np
+import pandas as pd
+import pytest
 from pandas import DataFrame
 from pandas.testing import assert_frame_equal
 
 
 from kloppy.domain import (
+    EventType,
     Period,
     DatasetFlag,
     Point,
@@ -22,7 +27,7 @@ from kloppy.domain import (
     PlayerData,
 )
 
-from kloppy import opta, tracab, statsbomb
+from kloppy import opta, tracab, statsbomb, sportscode
 
 
 class TestHelpers:
@@ -159,6 +164,313 @@ class TestHelpers:
         )
         assert_frame_equal(data_frame, expected_data_frame, check_like=True)
 
+    def test_to_pandas_tracking_additional_columns(self):
+        tracking_data = self._get_tracking_dataset()
+
+        data_frame = tracking_data.to_pandas(
+            additional_columns={
+                "match": "test",
+                "frame_id": lambda frame: frame.frame_id,
+                "ball_x": lambda frame: frame.ball_coordinates.x + 1,
+            }
+        )
+        assert list(data_frame.columns) == [
+            "period_id",
+            "timestamp",
+            "ball_state",
+            "ball_owning_team_id",
+            "ball_x",
+            "ball_y",
+            "match",
+            "frame_id",
+            "home_1_x",
+            "home_1_y",
+            "home_1_d",
+            "home_1_s",
+            "home_1_extra_data",
+            "extra_data",
+        ]
+        assert list(data_frame["match"]) == ["test", "test"]
+        assert list(data_frame["frame_id"]) == [1, 2]
+        assert list(data_frame["ball_x"]) == [101, 1]
+
+        # A custom record converter builds the rows itself
+        data_frame = tracking_data.to_pandas(
+            record_converter=lambda frame: {"frame_id": frame.frame_id},
+            additional_columns={"match": "test"},
+        )
+        assert list(data_frame.columns) == ["frame_id", "match"]
+
+    def test_to_pandas_long_layout(self):
+        tracking_data = self._get_tracking_dataset()
+
+        data_frame = tracking_data.to_pandas(
+            layout="long",
+            additional_columns={"match": "test"},
+        )
+        # Players that are not in a frame don't get a row
+        assert len(data_frame) == 1
+        row = data_frame.iloc[0]
+        assert row["frame_id"] == 2
+        assert row["player_id"] == "home_1"
+        assert row["team_id"] == "home"
+        assert row["jersey_no"] == 1
+        assert (row["x"], row["y"], row["d"], row["s"]) == (15, 35, 0.03, 10.5)
+        assert row["match"] == "test"
+        assert data_frame["team_id"].dtype == "category"
+
+        arrays = tracking_data.to_numpy(layout="long")
+        assert list(arrays["player_id"]) == ["home_1"]
+        assert list(arrays["x"]) == [15]
+        assert list(arrays["period_id"]) == [1]
+
+        # Frames without a period get a missing period id
+        tracking_data.records[1].period = None
+        arrays = tracking_data.to_numpy(layout="long")
+        assert np.isnan(arrays["period_id"][0])
+        data_frame = tracking_data.to_pandas(layout="long", dtypes="compact")
+        assert data_frame["period_id"].isna().all()
+        assert data_frame["period_id"].dtype == "Int8"
+
+    def test_to_pandas_compact_dtypes(self):
+        tracking_data = self._get_tracking_dataset()
+
+        data_frame = tracking_data.to_pandas(dtypes="compact")
+        assert data_frame["period_id"].dtype == "Int8"
+        assert data_frame["timestamp"].dtype == "float32"
+        assert data_frame["home_1_x"].dtype == "float32"
+        assert data_frame["ball_state"].dtype == "category"
+
+        data_frame = tracking_data.to_pandas(layout="long", dtypes="compact")
+        assert data_frame["frame_id"].dtype == "Int32"
+        assert data_frame["x"].dtype == "float32"
+
+        base_dir = os.path.dirname(__file__)
+        dataset = statsbomb.load(
+            lineup_data=f"{base_dir}/files/statsbomb_lineup.json",
+            event_data=f"{base_dir}/files/statsbomb_event.json",
+        )
+        df = dataset.to_pandas()
+        compact_df = dataset.to_pandas(dtypes="compact")
+        assert list(compact_df.columns) == list(df.columns)
+        for column in ["event_type", "result", "team_id", "pass_type"]:
+            assert compact_df[column].dtype == "category"
+        assert compact_df["success"].dtype == "boolean"
+        assert list(compact_df["event_type"].astype(str)) == list(
+            df["event_type"]
+        )
+        assert (
+            compact_df.memory_usage(deep=True).sum()
+            < df.memory_usage(deep=True).sum()
+        )
+
+    def test_to_pandas_compact_dtypes_missing_values(self):
+        base_dir = os.path.dirname(__file__)
+        # TRACAB data has no distance and speed
+        tracking_data = tracab.load(
+            meta_data=f"{base_dir}/files/tracab_meta.xml",
+            raw_data=f"{base_dir}/files/tracab_raw.dat",
+        )
+
+        data_frame = tracking_data.to_pandas(dtypes="compact")
+        for column in data_frame.columns:
+            if column.endswith(("_x", "_y", "_d", "_s")):
+                assert data_frame[column].dtype == "float32", column
+
+        # Shots don't have an end timestamp
+        dataset = statsbomb.load(
+            lineup_data=f"{base_dir}/files/statsbomb_lineup.json",
+            event_data=f"{base_dir}/files/statsbomb_event.json",
+            event_types=["shot"],
+        )
+        data_frame = dataset.to_pandas(dtypes="compact")
+        assert data_frame["end_timestamp"].isna().all()
+        assert data_frame["end_timestamp"].dtype == "float32"
+
+    def test_to_polars(self):
+        pl = pytest.importorskip("polars")
+
+        tracking_data = self._get_tracking_dataset()
+        df = tracking_data.to_polars(additional_columns={"match": "test"})
+        assert df.columns == list(
+            tracking_data.to_pandas(
+                additional_columns={"match": "test"}
+            ).columns
+        )
+        assert df["home_1_x"].to_list() == [None, 15]
+
+        df = tracking_data.to_polars(layout="long", lazy=True)
+        assert isinstance(df, pl.LazyFrame)
+        assert df.collect()["player_id"].to_list() == ["home_1"]
+
+        tracking_data.records[1].period = None
+        df = tracking_data.to_polars(layout="long")
+        assert df["period_id"].to_list() == [None]
+
+        base_dir = os.path.dirname(__file__)
+        dataset = statsbomb.load(
+            lineup_data=f"{base_dir}/files/statsbomb_lineup.json",
+            event_data=f"{base_dir}/files/statsbomb_event.json",
+        )
+        df = dataset.to_polars()
+        assert df.columns == list(dataset.to_pandas().columns)
+        assert df["event_type"].dtype == pl.Categorical
+        assert len(df.filter(pl.col("event_type") == "SHOT")) == len(
+            [
+                event
+                for event in dataset.events
+                if event.event_type == EventType.SHOT
+            ]
+        )
+
+    def test_iter_pandas(self):
+        tracking_data = self._get_tracking_dataset()
+
+        chunks = list(
+            tracking_data.iter_pandas(
+                chunk_size=1, additional_columns={"match": "test"}
+            )
+        )
+        assert len(chunks) == 2
+        # The first frame has no players, but the chunk has their columns
+        assert list(chunks[0].columns) == list(
+            tracking_data.to_pandas(
+                additional_columns={"match": "test"}
+            ).columns
+        )
+        assert list(chunks[1].columns) == list(chunks[0].columns)
+        assert np.isnan(chunks[0].loc[0, "home_1_x"])
+        assert chunks[1].loc[1, "home_1_x"] == 15
+
+        # Without a known schema the first chunk determines the columns
+        chunks = list(
+            tracking_data.to_pandas(
+                chunksize=1,
+                record_converter=lambda frame: {
+                    "frame_id": frame.frame_id,
+                    **(frame.other_data or {}),
+                },
+            )
+        )
+        assert [list(chunk.columns) for chunk in chunks] == [
+            ["frame_id"],
+            ["frame_id"],
+        ]
+
+    def test_iter_pandas_events(self):
+        base_dir = os.path.dirname(__file__)
+
+        dataset = statsbomb.load(
+            lineup_data=f"{base_dir}/files/statsbomb_lineup.json",
+            event_data=f"{base_dir}/files/statsbomb_event.json",
+        )
+        df = dataset.to_pandas()
+        chunks = list(dataset.to_pandas(chunksize=1000))
+
+        assert len(chunks) == 5
+        assert all(list(chunk.columns) == list(df.columns) for chunk in chunks)
+        assert list(pd.concat(chunks).event_id) == list(df.event_id)
+
+    def test_iter_pandas_compact_dtypes(self):
+        base_dir = os.path.dirname(__file__)
+
+        event_dataset = statsbomb.load(
+            lineup_data=f"{base_dir}/files/statsbomb_lineup.json",
+            event_data=f"{base_dir}/files/statsbomb_event.json",
+        )
+        tracking_dataset = tracab.load(
+            meta_data=f"{base_dir}/files/tracab_meta.xml",
+            raw_data=f"{base_dir}/files/tracab_raw.dat",
+            only_alive=False,
+        )
+        code_dataset = sportscode.load(f"{base_dir}/files/code_xml.xml")
+
+        for dataset, chunk_size, kwargs in [
+            (event_dataset, 500, dict(dtypes="compact")),
+            (tracking_dataset, 2, dict(dtypes="compact")),
+            (tracking_dataset, 2, dict(layout="long")),
+            (tracking_dataset, 2, dict(layout="long", dtypes="compact")),
+            (code_dataset, 2, dict(dtypes="compact")),
+        ]:
+            df = dataset.to_pandas(**kwargs)
+            chunks = list(dataset.to_pandas(chunksize=chunk_size, **kwargs))
+            assert len(chunks) > 1
+
+            # Categories are the same in every chunk, so they concatenate
+            concatenated = pd.concat(chunks)
+            assert concatenated.dtypes.to_dict() == df.dtypes.to_dict()
+            assert_frame_equal(concatenated, df)
+
+    def test_iter_pandas_default_dtypes(self):
+        base_dir = os.path.dirname(__file__)
+
+        event_dataset = opta.load(
+            f7_data=f"{base_dir}/files/opta_f7.xml",
+            f24_data=f"{base_dir}/files/opta_f24.xml",
+        )
+        tracking_dataset = tracab.load(
+            meta_data=f"{base_dir}/files/tracab_meta.xml",
+            raw_data=f"{base_dir}/files/tracab_raw.dat",
+            only_alive=False,
+        )
+        code_dataset = sportscode.load(f"{base_dir}/files/code_xml.xml")
+
+        for dataset, chunk_size in [
+            (event_dataset, 7),
+            (tracking_dataset, 2),
+            (code_dataset, 1),
+        ]:
+            df = dataset.to_pandas()
+            chunks = list(dataset.to_pandas(chunksize=chunk_size))
+            assert len(chunks) > 1
+
+            # The dtypes don't depend on the values in a chunk
+            for chunk in chunks:
+                assert chunk.dtypes.to_dict() == df.dtypes.to_dict()
+            assert_frame_equal(pd.concat(chunks), df)
+
+    def test_time_index(self):
+        base_dir = os.path.dirname(__file__)
+        dataset = tracab.load(
+            meta_data=f"{base_dir}/files/tracab_meta.xml",
+            raw_data=f"{base_dir}/files/tracab_raw.dat",
+            only_alive=False,
+        )
+        frames = dataset.frames
+
+        def linear_at(period_id, timestamp):
+            result = None
+            for frame in frames:
+                if (
+                    frame.period.id == period_id
+                    and frame.timestamp <= timestamp
+                ):
+                    result = frame
+            return result
+
+        for period_id, timestamp in [(1, 0.0), (1, 0.05), (2, 0.1), (1, 99)]:
+            assert dataset.at(period_id, timestamp) is linear_at(
+                period_id, timestamp
+            )
+        assert dataset.at(1, -1) is None
+        assert dataset.at(3, 0) is None
+
+        assert dataset.between(1, 0.04, 0.08) == [
+            frame
+            for frame in frames
+            if frame.period.id == 1 and 0.04 <= frame.timestamp <= 0.08
+        ]
+
+        assert dataset.nearest(1, 0.05) is frames[1]
+        assert dataset.nearest(1, 0.059) is frames[1]
+        assert dataset.nearest(1, 10, tolerance=1) is None
+
+        # The index follows changes to the records
+        dataset.records.append(
+            replace(frames[0], frame_id=9999, timestamp=5.0)
+        )
+        assert dataset.at(1, 5.0).frame_id == 9999
+
     def test_to_pandas_generic_events(self):
         base_dir = os.path.dirname(__file__)
         dataset = opta.load(
@@ -184,6 +496,51 @@ class TestHelpers:
         assert incomplete_passes.loc[0, "end_coordinates_y"] == 0.90625
         assert incomplete_passes.loc[0, "end_coordinates_x"] == 0.7125
 
+    def test_to_pandas_event_columns(self):
+        base_dir = os.path.dirname(__file__)
+
+        dataset = statsbomb.load(
+            lineup_data=f"{base_dir}/files/statsbomb_lineup.json",
+            event_data=f"{base_dir}/files/statsbomb_event.json",
+        )
+        df = dataset.to_pandas(
+            additional_columns={
+                "match": "test",
+                "index": np.arange(len(dataset.events)),
+                "player_name": lambda event: str(event.player or ""),
+            }
+        )
+        assert len(df) == len(dataset.events)
+        # Additional columns follow the columns of the first event
+        assert list(df.columns[:16]) == [
+            "event_id",
+            "event_type",
+            "result",
+            "success",
+            "period_id",
+            "timestamp",
+            "end_timestamp",
+            "ball_state",
+            "ball_owning_team",
+            "team_id",
+            "player_id",
+            "coordinates_x",
+            "coordinates_y",
+            "match",
+            "index",
+            "player_name",
+        ]
+        assert list(df["index"]) == list(range(len(dataset.events)))
+
+        # Columns of specific event and qualifier types
+        event = dataset.events[192]
+        row = df.loc[192]
+        assert row["event_type"] == "PASS"
+        assert row["pass_type"] == "LONG_BALL"
+        assert row["end_coordinates_x"] == event.receiver_coordinates.x
+        assert row["receiver_player_id"] == event.receiver_player.player_id
+        assert np.isnan(df.loc[0, "pass_type"])
+
     def test_to_pandas_additional_columns(self):
         tracking_data = self._get_tracking_dataset()
 
@@ -214,3 +571,34 @@ class TestHelpers:
         )
 
         assert_frame_equal(data_frame, expected_data_frame, check_like=True)
+
+    def test_transform_event_data(self):
+        base_dir = os.path.dirname(__file__)
+
+        dataset = statsbomb.load(
+            lineup_data=f"{base_dir}/files/statsbomb_lineup.json",
+            event_data=f"{base_dir}/files/statsbomb_event.json",
+            coordinates="statsbomb",
+        )
+
+        transformed_dataset = dataset.transform(
+            to_pitch_dimensions=[[0, 1], [0, 1]],
+        )
+
+        idx, pass_event = next(
+            (idx, event)
+            for idx, event in enumerate(dataset.events)
+            if event.event_name == "pass"
+        )
+        transformed_pass_event = transformed_dataset.events[idx]
+
+        assert transformed_pass_event is not pass_event
+        assert transformed_pass_event.coordinates == Point(
+            x=pass_event.coordinates.x / 120, y=pass_event.coordinates.y / 80
+        )
+        assert transformed_pass_event.receiver_coordinates == Point(
+            x=pass_event.receiver_coordinates.x / 120,
+            y=pass_event.receiver_coordinates.y / 80,
+        )
+        assert transformed_pass_event.event_id == pass_event.event_id
+        assert transformed_pass_event.qualifiers is pass_event.qualifiers
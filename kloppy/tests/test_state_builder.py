@@ -2,6 +2,7 @@ import os
 from itertools import groupby
 
 from kloppy.domain import EventType, Event, EventDataset, FormationType
+from kloppy.domain.services.state_builder import StateBuilderSession
 from kloppy.domain.services.state_builder.builder import StateBuilder, T
 from kloppy.utils import performance_logging
 from kloppy import statsbomb
@@ -125,3 +126,153 @@ class TestStateBuilder:
         assert dataset_with_state.events[1].state["custom"] == 3
         assert dataset_with_state.events[2].state["custom"] == 5
         assert dataset_with_state.events[3].state["custom"] == 7
+
+    def test_add_state_without_copying_events(self):
+        dataset = self._load_dataset()
+
+        dataset_with_state = dataset.add_state("score")
+        assert all(
+            event is event_with_state
+            for event, event_with_state in zip(
+                dataset.events, dataset_with_state.events
+            )
+        )
+
+        # Events with the same score share the state object
+        scores = {
+            id(event.state["score"]) for event in dataset_with_state.events
+        }
+        assert len(scores) == 4
+
+        # State that was added before remains available
+        dataset_with_state = dataset_with_state.add_state("sequence")
+        event = dataset_with_state.events[-1]
+        assert set(event.state) == {"sequence", "score"}
+        assert str(event.state["score"]) == "3-0"
+
+    def test_add_state_leaves_dataset_untouched(self):
+        dataset = self._load_dataset().add_state("score")
+        events = list(dataset.events)
+        states = [event.state for event in dataset.events]
+
+        filtered = dataset.filter(lambda event: event.team is not None)
+        filtered_with_state = filtered.add_state("sequence", copy_events=True)
+        filtered_with_state.add_state("sequence", copy_events=True)
+
+        assert filtered.events[0] is not filtered_with_state.events[0]
+        assert all(
+            event is expected
+            for event, expected in zip(dataset.events, events)
+        )
+        assert all(
+            event.state is state
+            for event, state in zip(dataset.events, states)
+        )
+        assert "sequence" not in dataset.events[-1].state
+        assert set(filtered_with_state.events[-1].state) == {
+            "sequence",
+            "score",
+        }
+        # The existing state is shared, not copied
+        assert filtered_with_state.events[-1].state._parent is states[-1]
+
+    def test_state_at(self):
+        dataset = self._load_dataset()
+        dataset_with_state = self._load_dataset().add_state(
+            "score", "sequence"
+        )
+
+        for event_index in [0, 1, 99, 100, 101, 2000, 4022]:
+            for builder_key in ["score", "sequence"]:
+                assert dataset.state_at(
+                    event_index, builder_key, checkpoint_interval=100
+                ) == (
+                    dataset_with_state.events[event_index].state[builder_key]
+                )
+
+        assert not any(event.state for event in dataset.events)
+        assert str(dataset.state_at(-1, "score")) == "3-0"
+
+    def test_state_at_appended_events(self):
+        dataset = self._load_dataset()
+        expected = self._load_dataset().add_state("score")
+
+        # Query the first events, then append the rest like during a match
+        events = list(dataset.events)
+        del dataset.records[150:]
+        assert dataset.state_at(-1, "score", checkpoint_interval=100) == (
+            expected.events[149].state["score"]
+        )
+
+        dataset.records.extend(events[150:])
+        for event_index in [150, 199, 200, 4022]:
+            assert dataset.state_at(
+                event_index, "score", checkpoint_interval=100
+            ) == (expected.events[event_index].state["score"])
+        assert str(dataset.state_at(-1, "score")) == "3-0"
+
+    def test_state_builder_session(self):
+        dataset = self._load_dataset("statsbomb_15986")
+        builder_keys = ["lineup", "score", "sequence", "formation"]
+        expected = self._load_dataset("statsbomb_15986").add_state(
+            *builder_keys
+        )
+
+        # Feed the events in chunks, like they would arrive during a match
+        session = StateBuilderSession(dataset, builder_keys)
+        events = []
+        for i in range(0, len(dataset.events), 500):
+            events.extend(session.process(dataset.events[i : i + 500]))
+
+        assert len(events) == len(expected.events)
+        for event, expected_event in zip(events, expected.events):
+            assert dict(event.state) == dict(expected_event.state)
+
+    def test_sequence_index(self):
+        dataset = self._load_dataset().add_state("sequence")
+
+        assert len(dataset.get_sequence(51)) == 14
+        assert all(
+            event.state["sequence"].sequence_id == 51
+            for event in dataset.get_sequence(51)
+        )
+
+        spans = dataset.get_sequences()
+        assert sum(span.end - span.start for span in spans) == len(
+            dataset.events
+        )
+
+        home_team, away_team = dataset.metadata.teams
+        for span in dataset.get_sequences(home_team):
+            events = dataset.events[span.start : span.end]
+            assert all(
+                event.state["sequence"].team == home_team for event in events
+            )
+            assert span.end_event_type == events[-1].event_type
+
+        # Index that is built from the state of the events is the same
+        filtered_dataset = dataset.filter(lambda event: True)
+        assert filtered_dataset.get_sequences() == spans
+
+    def test_sequence_index_appended_events(self):
+        dataset = self._load_dataset()
+        expected = self._load_dataset().add_state("sequence")
+
+        # Add state to the first events, then append the rest like during a
+        # match
+        events = list(dataset.events)
+        del dataset.records[200:]
+        session = StateBuilderSession(dataset, ["sequence"])
+        session.process(dataset.events)
+        assert dataset.get_sequences()[-1].end == 200
+
+        dataset.records.extend(session.process(events[200:]))
+        assert [
+            (span.sequence_id, span.start, span.end)
+            for span in dataset.get_sequences()
+        ] == [
+            (span.sequence_id, span.start, span.end)
+            for span in expected.get_sequences()
+        ]
+        span = dataset.get_sequences()[-1]
+        assert dataset.get_sequence(span.sequence_id) == events[span.start :]
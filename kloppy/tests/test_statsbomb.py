@@ -1,4 +1,5 @@
 import os
+from timeit import repeat
 
 import pytest
 
@@ -6,7 +7,9 @@ from kloppy.domain import (
     AttackingDirection,
     BodyPart,
     BodyPartQualifier,
+    CardQualifier,
     DatasetType,
+    EventType,
     Orientation,
     Period,
     Point,
@@ -17,8 +20,10 @@ from kloppy.domain import (
 from kloppy import statsbomb
 from kloppy.domain.models.event import (
     CardType,
+    EnumQualifier,
     PassQualifier,
     PassType,
+    SetPieceQualifier,
 )
 
 
@@ -209,3 +214,111 @@ class TestStatsbomb:
         )
 
         assert len(dataset.events) == 23
+
+    def test_qualifier_lookup(self, lineup_data: str, event_data: str):
+        """
+        Test qualifier lookup by (base) type and the qualifier column
+        """
+        dataset = statsbomb.load(
+            lineup_data=lineup_data,
+            event_data=event_data,
+        )
+
+        event = dataset.events[1433]
+        assert event.get_qualifier_value(PassQualifier) == PassType.CROSS
+        # Base classes find the first qualifier of that kind
+        assert event.get_qualifier_value(EnumQualifier) == next(
+            qualifier.value
+            for qualifier in event.qualifiers
+            if isinstance(qualifier, EnumQualifier)
+        )
+
+        # Changes to the qualifiers are picked up
+        event.qualifiers.insert(0, PassQualifier(value=PassType.LONG_BALL))
+        assert event.get_qualifier_value(PassQualifier) == PassType.LONG_BALL
+        event.qualifiers[0] = PassQualifier(value=PassType.THROUGH_BALL)
+        assert (
+            event.get_qualifier_value(PassQualifier) == PassType.THROUGH_BALL
+        )
+        event.qualifiers[0].value = PassType.HIGH_PASS
+        assert event.get_qualifier_value(PassQualifier) == PassType.HIGH_PASS
+
+        body_parts = dataset.get_qualifier_values(BodyPartQualifier)
+        assert len(body_parts) == len(dataset.events)
+        assert body_parts[792] == BodyPart.HEAD
+        assert body_parts[195] is None
+
+    def test_qualifier_lookup_speed(self, lineup_data: str, event_data: str):
+        """
+        Test the qualifier lookup is not slower than iterating over the
+        qualifiers
+        """
+        dataset = statsbomb.load(
+            lineup_data=lineup_data,
+            event_data=event_data,
+        )
+        events = [event for event in dataset.events if event.qualifiers]
+        qualifier_types = [
+            SetPieceQualifier,
+            BodyPartQualifier,
+            PassQualifier,
+            CardQualifier,
+        ]
+
+        def get_qualifier_value(event, qualifier_type):
+            for qualifier in event.qualifiers:
+                if isinstance(qualifier, qualifier_type):
+                    return qualifier.value
+            return None
+
+        def lookup():
+            for event in events:
+                for qualifier_type in qualifier_types:
+                    event.get_qualifier_value(qualifier_type)
+
+        def loop():
+            for event in events:
+                for qualifier_type in qualifier_types:
+                    get_qualifier_value(event, qualifier_type)
+
+        assert min(repeat(lookup, number=5, repeat=5)) <= min(
+            repeat(loop, number=5, repeat=5)
+        )
+
+    def test_to_columns(self, lineup_data: str, event_data: str):
+        """
+        Test the columnar representation and rebuilding events from it
+        """
+        dataset = statsbomb.load(
+            lineup_data=lineup_data,
+            event_data=event_data,
+        )
+        home_team = dataset.metadata.teams[0]
+
+        columns = dataset.to_columns()
+        assert len(columns) == len(dataset.events)
+
+        mask = columns.mask(event_type=EventType.PASS, team=home_team)
+        expected = [
+            event
+            for event in dataset.events
+            if event.event_type == EventType.PASS and event.team == home_team
+        ]
+        # The original events are kept
+        assert columns.to_events(mask) == expected
+        assert columns.filter(mask).event(0) is expected[0]
+
+        columns = dataset.to_columns(keep_events=False)
+        passes = columns.filter(mask)
+        assert len(passes) == len(expected)
+        for rebuilt, event in zip(passes.to_events(), expected):
+            assert type(rebuilt) is type(event)
+            assert rebuilt.event_id == event.event_id
+            assert rebuilt.timestamp == event.timestamp
+            assert rebuilt.player == event.player
+            assert rebuilt.coordinates == event.coordinates
+            assert rebuilt.result == event.result
+            assert rebuilt.receiver_player == event.receiver_player
+            assert rebuilt.receiver_coordinates == event.receiver_coordinates
+            assert rebuilt.qualifiers == event.qualifiers
+            assert rebuilt.raw_event is None
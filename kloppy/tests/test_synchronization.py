@@ -0,0 +1,59 @@
+import os
+
+import pytest
+
+from kloppy import metrica
+from kloppy.domain.services.synchronization import sync
+
+
+class TestSynchronization:
+    """"""
+
+    @pytest.fixture
+    def event_dataset(self):
+        base_dir = os.path.dirname(__file__)
+        return metrica.load_event(
+            event_data=f"{base_dir}/files/metrica_events.json",
+            meta_data=f"{base_dir}/files/epts_metrica_metadata.xml",
+        )
+
+    @pytest.fixture
+    def tracking_dataset(self):
+        base_dir = os.path.dirname(__file__)
+        return metrica.load_tracking_epts(
+            meta_data=f"{base_dir}/files/epts_metrica_metadata.xml",
+            raw_data=f"{base_dir}/files/epts_metrica_tracking.txt",
+        )
+
+    def test_sync(self, event_dataset, tracking_dataset):
+        result = event_dataset.sync(tracking_dataset, tolerance=0.1)
+        assert len(result) == len(event_dataset.events)
+
+        for i, event in enumerate(event_dataset.events):
+            expected = tracking_dataset.nearest(
+                event.period.id, event.timestamp, tolerance=0.1
+            )
+            assert result.get_frame(i) is expected
+
+        assert 0 < result.matched.sum() < len(event_dataset.events)
+        assert result.frames[5] is tracking_dataset.frames[15]
+
+        # Without tolerance every event of a period with frames matches
+        result = sync(event_dataset, tracking_dataset)
+        assert result.frames[0] is tracking_dataset.frames[0]
+
+    def test_sync_offset_and_drift(self, event_dataset, tracking_dataset):
+        event = event_dataset.events[5]
+        frame = tracking_dataset.frames[20]
+
+        offset = frame.timestamp - event.timestamp
+        result = sync(event_dataset, tracking_dataset, offset=offset)
+        assert result.get_frame(5) is frame
+
+        # Offsets per period
+        result = sync(event_dataset, tracking_dataset, offset={1: offset})
+        assert result.get_frame(5) is frame
+
+        drift = offset / event.timestamp
+        result = sync(event_dataset, tracking_dataset, drift=drift)
+        assert result.get_frame(5) is frame
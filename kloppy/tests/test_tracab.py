@@ -107,3 +107,23 @@ class TestTracabTracking:
         assert dataset.records[0].players_data[
             player_home_19
         ].coordinates == Point(x=0.3766, y=0.5489999999999999)
+
+    def test_frame_lookup(self, meta_data: str, raw_data: str):
+        dataset = tracab.load(
+            meta_data=meta_data, raw_data=raw_data, only_alive=True
+        )
+
+        assert dataset.get_frame(101) is dataset.frames[1]
+        assert dataset.get_frame(200).period.id == 2
+        # Dead ball frame was skipped
+        assert dataset.get_frame(102) is None
+        assert dataset.get_frame(1) is None
+
+        assert [
+            frame.frame_id for frame in dataset.get_frame_range(101, 200)
+        ] == [101, 200]
+
+        # The index follows filtered datasets
+        filtered = dataset.filter(lambda frame: frame.period.id == 2)
+        assert filtered.get_frame(101) is None
+        assert filtered.get_frame(201) is filtered.frames[1]